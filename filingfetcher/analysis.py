@@ -4,15 +4,31 @@ Rule-based analyzers that transform SEC filing content into actionable insights.
 
 from __future__ import annotations
 
+import io
 import logging
 import math
 import re
+import string
+import threading
 from dataclasses import dataclass
 from typing import Iterable, List, Optional, Sequence, Tuple
 from xml.etree import ElementTree as ET
 
+try:  # Optional C-backed XML parser with the ElementTree API.
+    from lxml import etree as LET
+except ImportError:  # pragma: no cover - optional dependency
+    LET = None
+
 from .models import AnalysisResult, FilingDocument, FilingEvent
-from .utils import html_to_text, normalize_whitespace, split_sentences
+from .utils import (
+    HTML_TAG_RE,
+    contains_any,
+    get_process_pool,
+    html_to_text,
+    keyword_counts,
+    normalize_whitespace,
+    split_sentences,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -52,6 +68,10 @@ NEGATIVE_KEYWORDS: Sequence[Tuple[str, float]] = (
     ("decline", 1.0),
 )
 
+HIGHLIGHT_NEEDLES: Tuple[str, ...] = tuple(
+    phrase.lower() for phrase, _ in tuple(POSITIVE_KEYWORDS) + tuple(NEGATIVE_KEYWORDS)
+)
+
 FORM4_OPEN_MARKET_CODES = {"P", "S"}
 FORM4_EXCLUDED_SEC_TITLES = {"option", "warrant", "unit", "right", "rsu", "restricted"}
 FORM4_PLAN_INDICATORS = {
@@ -60,97 +80,181 @@ FORM4_PLAN_INDICATORS = {
     "rule 10b5-1",
 }
 
+ITEM_HEADER_RE = re.compile(r"Item\s+\d+(?:\.\d+)?", re.IGNORECASE)
+FORM4_PLAN_RE = re.compile(
+    "|".join(re.escape(indicator) for indicator in sorted(FORM4_PLAN_INDICATORS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+FORM4_CODE_PATH = "transactionCoding/transactionCode"
+FORM4_SECURITY_TITLE_PATH = "securityTitle/value"
+FORM4_SHARES_PATH = "transactionAmounts/transactionShares/value"
+FORM4_PRICE_PATH = "transactionAmounts/transactionPricePerShare/value"
+FORM4_ACQUIRED_DISPOSED_PATH = "transactionAmounts/transactionAcquiredDisposedCode/value"
+FORM4_FOLLOWING_PATH = "postTransactionAmounts/sharesOwnedFollowingTransaction/value"
+
+
+def _compile_text_xpath(path: str):
+    return LET.XPath(f"string({path})", smart_strings=False) if LET is not None else None
+
+
+# Compiled once; on lxml elements these evaluate in C and return "" for missing fields.
+_FORM4_CODE_XP = _compile_text_xpath(FORM4_CODE_PATH)
+_FORM4_SECURITY_TITLE_XP = _compile_text_xpath(FORM4_SECURITY_TITLE_PATH)
+_FORM4_SHARES_XP = _compile_text_xpath(FORM4_SHARES_PATH)
+_FORM4_PRICE_XP = _compile_text_xpath(FORM4_PRICE_PATH)
+_FORM4_ACQUIRED_DISPOSED_XP = _compile_text_xpath(FORM4_ACQUIRED_DISPOSED_PATH)
+_FORM4_FOLLOWING_XP = _compile_text_xpath(FORM4_FOLLOWING_PATH)
+
+XML_PARSE_ERRORS: Tuple[type, ...] = (ET.ParseError,) + ((LET.XMLSyntaxError,) if LET else ())
+_LXML_PARSERS = threading.local()  # lxml parser instances must not be shared across threads
 
-def _score_keywords_with_details(text: str, keywords: Sequence[Tuple[str, float]]):
-    lowered = text.lower()
+_COMMA_DELETE = str.maketrans("", "", ",")
+_LEADING_WHITESPACE_RE = re.compile(rb"\s*")
+_ASCII_LETTERS = string.ascii_letters.encode("ascii")
+_ASCII_DIGITS = string.digits.encode("ascii")
+
+
+def _score_keywords_with_details(lowered: str, keywords: Sequence[Tuple[str, float]]):
+    """Score pre-casefolded text against (phrase, weight) keywords."""
+    counts = keyword_counts(lowered, tuple(phrase for phrase, _ in keywords))
     total = 0.0
     matches = []
+    add_match = matches.append
     for phrase, weight in keywords:
-        count = lowered.count(phrase)
+        count = counts[phrase]
         if count:
             contribution = weight * count
             total += contribution
-            matches.append((phrase, contribution, count))
+            add_match((phrase, contribution, count))
     return total, matches
 
 
 def _safe_iter_text(root: ET.Element) -> str:
+    """Join the raw text fragments; callers collapse whitespace with normalize_whitespace."""
     try:
-        return " ".join(fragment.strip() for fragment in root.itertext())
+        return " ".join(root.itertext())
     except Exception:  # pragma: no cover - defensive
         return ""
 
 
-def _is_html(document: FilingDocument) -> bool:
+def _sniff_document_kind(document: FilingDocument) -> str:
+    """Classify a document as "html", "xml" or "text" without copying its content."""
     name = document.filename.lower()
     if name.endswith((".htm", ".html")):
-        return True
-    trimmed = document.content.lstrip()
-    return trimmed.startswith(b"<html") or trimmed.startswith(b"<!doctype html")
-
-
-def _is_xml(document: FilingDocument) -> bool:
-    name = document.filename.lower()
-    if name.endswith(".xml"):
-        return True
-    trimmed = document.content.lstrip()
-    return trimmed.startswith(b"<?xml")
+        return "html"
+    content = document.content
+    start = _LEADING_WHITESPACE_RE.match(content).end()
+    head = content[start : start + len(b"<!doctype html")].lower()
+    if head.startswith((b"<html", b"<!doctype html")):
+        return "html"
+    if name.endswith(".xml") or head.startswith(b"<?xml"):
+        return "xml"
+    return "text"
+
+
+def _parse_xml(raw: str) -> ET.Element:
+    """Parse XML text with lxml when available, falling back to ElementTree."""
+    if LET is None:
+        return ET.fromstring(raw)
+    parser = getattr(_LXML_PARSERS, "parser", None)
+    if parser is None:
+        # Decode as UTF-8 regardless of the declared encoding, matching how the stdlib
+        # parser treats the already-decoded document text.
+        parser = LET.XMLParser(
+            encoding="utf-8",
+            remove_blank_text=True,
+            remove_comments=True,
+            remove_pis=True,
+            ns_clean=True,
+        )
+        _LXML_PARSERS.parser = parser
+    return LET.fromstring(raw.encode("utf-8"), parser)
 
 
-def _document_plain_text(document: FilingDocument) -> str:
+def _document_plain_text(document: FilingDocument) -> Tuple[str, Optional[ET.Element]]:
+    """Return the document's plain text and, for well-formed XML, its parsed root."""
     raw = document.text()
-    if _is_html(document):
-        return html_to_text(raw)
-    if _is_xml(document):
+    kind = _sniff_document_kind(document)
+    if kind == "html":
+        return html_to_text(raw), None
+    if kind == "xml":
         try:
-            root = ET.fromstring(raw)
-            return normalize_whitespace(_safe_iter_text(root))
-        except ET.ParseError:
-            return normalize_whitespace(re.sub(r"<[^>]+>", " ", raw))
-    return normalize_whitespace(raw)
+            root = _parse_xml(raw)
+            return normalize_whitespace(_safe_iter_text(root)), root
+        except XML_PARSE_ERRORS:
+            return normalize_whitespace(HTML_TAG_RE.sub(" ", raw)), None
+    return normalize_whitespace(raw), None
 
 
-def _extract_item_sections(text: str) -> List[Tuple[str, str]]:
-    pattern = re.compile(r"Item\s+\d+(?:\.\d+)?", re.IGNORECASE)
-    matches = list(pattern.finditer(text))
+def _extract_item_sections(text: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+    """Split 8-K text into (header, body) pairs, stopping once ``limit`` sections are found."""
     sections: List[Tuple[str, str]] = []
 
-    for idx, match in enumerate(matches):
-        start = match.start()
-        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
-
-        header_end = text.find(".", match.end())
-        if header_end == -1 or header_end > end:
+    def _add_section(match: re.Match, end: int) -> None:
+        # Only look for the header's closing period inside this section's span.
+        header_end = text.find(".", match.end(), end)
+        if header_end == -1:
             header_end = match.end()
 
-        header = normalize_whitespace(text[start : header_end + 1])
+        header = normalize_whitespace(text[match.start() : header_end + 1])
         body = normalize_whitespace(text[header_end + 1 : end])
 
         if header and body:
             sections.append((header, body))
 
+    previous: Optional[re.Match] = None
+    for match in ITEM_HEADER_RE.finditer(text):
+        if previous is not None:
+            _add_section(previous, match.start())
+            if limit is not None and len(sections) >= limit:
+                return sections
+        previous = match
+
+    if previous is not None:
+        _add_section(previous, len(text))
+
     return sections
 
 
-def _highlight_sentences(text: str, needles: Iterable[str], limit: int = 3) -> List[str]:
+def _highlight_sentences(
+    text: str,
+    needles: Tuple[str, ...],
+    limit: int = 3,
+    lowered: Optional[str] = None,
+) -> List[str]:
+    """Return up to ``limit`` informative sentences containing any lowercase needle."""
+    if lowered is not None and not contains_any(lowered, needles):
+        return []
     sentences = split_sentences(text)
     sentences = _filter_informative(sentences)
     highlights = []
-    lowered_needles = [needle.lower() for needle in needles]
     for sentence in sentences:
         lower_sentence = sentence.lower()
-        if any(needle in lower_sentence for needle in lowered_needles):
+        if contains_any(lower_sentence, needles):
             highlights.append(sentence)
         if len(highlights) >= limit:
             break
     return highlights
 
 
+def _count_letters_digits(sentence: str) -> Tuple[int, int]:
+    """Count alphabetic and digit characters, using C-level translate for ASCII text."""
+    if sentence.isascii():
+        encoded = sentence.encode("ascii")
+        letters = len(encoded) - len(encoded.translate(None, _ASCII_LETTERS))
+        digits = len(encoded) - len(encoded.translate(None, _ASCII_DIGITS))
+        return letters, digits
+    letters = sum(ch.isalpha() for ch in sentence)
+    digits = sum(ch.isdigit() for ch in sentence)
+    return letters, digits
+
+
 def _filter_informative(sentences: List[str], min_letters: int = 20) -> List[str]:
     filtered = []
     for sentence in sentences:
-        letters = sum(ch.isalpha() for ch in sentence)
-        digits = sum(ch.isdigit() for ch in sentence)
+        if len(sentence) < min_letters:
+            continue  # cannot contain enough letters; skip the character count
+        letters, digits = _count_letters_digits(sentence)
         if letters >= min_letters and letters >= digits:
             filtered.append(sentence)
     return filtered
@@ -164,12 +268,19 @@ def _format_keyword_matches(matches) -> str:
     return "; ".join(parts)
 
 
-def _percentage_change(before: float, after: float) -> Optional[float]:
+def _parse_number(text: Optional[str]) -> Optional[float]:
+    """Parse a comma-grouped number with float() semantics, returning None for blanks or junk."""
+    cleaned = (text or "").translate(_COMMA_DELETE)
+    if not cleaned or cleaned.isspace():
+        return None
     try:
-        before = float(before)
-        after = float(after)
-    except (TypeError, ValueError):
+        return float(cleaned)
+    except ValueError:
         return None
+
+
+def _percentage_change_f(before: float, after: float) -> Optional[float]:
+    """Percentage change between two floats, or None when ``before`` is zero."""
     if before == 0:
         return None
     return (after - before) / before * 100
@@ -178,26 +289,41 @@ def _percentage_change(before: float, after: float) -> Optional[float]:
 class FilingAnalyzer:
     """Aggregate heuristics that assess filings for sentiment, novelty and summaries."""
 
+    def analyze_many(self, events: Iterable[FilingEvent]) -> List[AnalysisResult]:
+        """
+        Analyze several filings across a shared process pool.
+
+        Results are returned in input order. Batches of zero or one event are
+        analyzed in-process to avoid the pickling round-trip.
+        """
+        events = list(events)
+        if len(events) <= 1:
+            return [self.analyze(event) for event in events]
+        return list(get_process_pool().map(self.analyze, events))
+
     def analyze(self, event: FilingEvent) -> AnalysisResult:
         primary_doc = self._select_primary_document(event)
+        primary_root: Optional[ET.Element] = None
         if primary_doc:
-            primary_text = _document_plain_text(primary_doc)
+            primary_text, primary_root = _document_plain_text(primary_doc)
         else:
             primary_text = ""
+        lowered_text = primary_text.casefold()
 
         sentiment_label, sentiment_score, sentiment_details = self._classify_sentiment(
-            primary_text, event.submission_type
+            lowered_text, event.submission_type
         )
 
         highlights = _highlight_sentences(
             primary_text,
-            [phrase for phrase, _ in POSITIVE_KEYWORDS + NEGATIVE_KEYWORDS],
+            HIGHLIGHT_NEEDLES,
+            lowered=lowered_text,
         )
 
         insider_notable = None
         insider_summary = None
         if event.submission_type.strip().upper() == "4" and primary_doc is not None:
-            insider_notable, insider_summary = self._analyze_form4(primary_doc)
+            insider_notable, insider_summary = self._analyze_form4(primary_doc, primary_root)
 
         eli5_summary = None
         if event.submission_type.strip().upper() == "8-K" and primary_doc is not None:
@@ -235,9 +361,9 @@ class FilingAnalyzer:
 
         return event.documents[0]
 
-    def _classify_sentiment(self, text: str, submission_type: str) -> Tuple[str, float, str]:
-        pos_score, pos_matches = _score_keywords_with_details(text, POSITIVE_KEYWORDS)
-        neg_score, neg_matches = _score_keywords_with_details(text, NEGATIVE_KEYWORDS)
+    def _classify_sentiment(self, lowered: str, submission_type: str) -> Tuple[str, float, str]:
+        pos_score, pos_matches = _score_keywords_with_details(lowered, POSITIVE_KEYWORDS)
+        neg_score, neg_matches = _score_keywords_with_details(lowered, NEGATIVE_KEYWORDS)
         score = pos_score - neg_score
 
         label = "neutral"
@@ -258,26 +384,44 @@ class FilingAnalyzer:
 
         return label, score, " | ".join(contributions)
 
-    def _analyze_form4(self, document: FilingDocument) -> Tuple[Optional[bool], Optional[str]]:
+    def _analyze_form4(
+        self,
+        document: FilingDocument,
+        root: Optional[ET.Element] = None,
+    ) -> Tuple[Optional[bool], Optional[str]]:
         raw = document.text()
+        plan_result = (False, "Trade executed under a Rule 10b5-1 plan.")
+        notable_transactions = []
+        aff_plan_seen = False
+
+        # Reuse an already parsed tree when available; otherwise stream the document so
+        # plan trades exit as soon as the flag is seen and each transaction subtree is
+        # released once it has been interpreted.
+        streaming = root is None
+        if streaming:
+            elements = (elem for _, elem in ET.iterparse(io.StringIO(raw), events=("end",)))
+        else:
+            if (root.findtext(".//aff10b5One") or "").strip() == "1":
+                return plan_result
+            elements = root.iterfind(".//nonDerivativeTransaction")
         try:
-            root = ET.fromstring(raw)
+            for elem in elements:
+                if elem.tag == "aff10b5One":
+                    if not aff_plan_seen and (elem.text or "").strip() == "1":
+                        return plan_result
+                    aff_plan_seen = True
+                elif elem.tag == "nonDerivativeTransaction":
+                    summary = self._interpret_form4_transaction(elem)
+                    if summary is not None:
+                        notable_transactions.append(summary)
+                    if streaming:
+                        elem.clear()
         except ET.ParseError:
             LOGGER.warning("Unable to parse Form 4 XML for %s", document.filename)
             return None, "Could not parse Form 4 XML."
 
-        raw_lower = raw.lower()
-        aff_plan_flag = "".join(root.findtext(".//aff10b5One", default="")).strip()
-        if aff_plan_flag == "1" or any(ind in raw_lower for ind in FORM4_PLAN_INDICATORS):
-            return False, "Trade executed under a Rule 10b5-1 plan."
-
-        notable_transactions = []
-
-        for tx in root.findall(".//nonDerivativeTransaction"):
-            summary = self._interpret_form4_transaction(tx)
-            if summary is None:
-                continue
-            notable_transactions.append(summary)
+        if FORM4_PLAN_RE.search(raw):
+            return plan_result
 
         if not notable_transactions:
             return False, "No open-market common stock transactions detected."
@@ -286,57 +430,41 @@ class FilingAnalyzer:
         return True, summary_text
 
     def _interpret_form4_transaction(self, element: ET.Element) -> Optional[str]:
-        code = (element.findtext("./transactionCoding/transactionCode") or "").strip().upper()
+        use_xpath = LET is not None and isinstance(element, LET._Element)
+        findtext = element.findtext
+
+        code = (_FORM4_CODE_XP(element) if use_xpath else findtext(FORM4_CODE_PATH) or "").strip().upper()
         if code not in FORM4_OPEN_MARKET_CODES:
             return None
 
         security_title = (
-            element.findtext("./securityTitle/value") or ""
+            _FORM4_SECURITY_TITLE_XP(element) if use_xpath else findtext(FORM4_SECURITY_TITLE_PATH) or ""
         ).strip().lower()
         if any(token in security_title for token in FORM4_EXCLUDED_SEC_TITLES):
             return None
 
-        shares_text = element.findtext("./transactionAmounts/transactionShares/value") or ""
-        try:
-            shares = float(shares_text.replace(",", ""))
-        except ValueError:
-            shares = None
+        shares = _parse_number(_FORM4_SHARES_XP(element) if use_xpath else findtext(FORM4_SHARES_PATH))
         if not shares or shares <= 0:
             return None
 
-        price_text = element.findtext("./transactionAmounts/transactionPricePerShare/value") or ""
-        try:
-            price = float(price_text.replace(",", ""))
-        except ValueError:
-            price = None
+        price = _parse_number(_FORM4_PRICE_XP(element) if use_xpath else findtext(FORM4_PRICE_PATH))
 
         acquired_or_disposed = (
-            element.findtext("./transactionAmounts/transactionAcquiredDisposedCode/value")
-            or ""
+            _FORM4_ACQUIRED_DISPOSED_XP(element) if use_xpath else findtext(FORM4_ACQUIRED_DISPOSED_PATH) or ""
         ).strip().upper()
 
         action = "purchased" if code == "P" or acquired_or_disposed == "A" else "sold"
 
-        following_text_raw = (
-            element.findtext("./postTransactionAmounts/sharesOwnedFollowingTransaction/value")
-            or ""
+        following_val = _parse_number(
+            _FORM4_FOLLOWING_XP(element) if use_xpath else findtext(FORM4_FOLLOWING_PATH)
         )
-        following_text = following_text_raw.replace(",", "")
-        prior_text = None
-        if shares is not None and following_text:
-            try:
-                following_val = float(following_text)
-                if action == "purchased":
-                    prior_val = following_val - shares
-                else:
-                    prior_val = following_val + shares
-                prior_text = f"{prior_val}"
-            except ValueError:
-                prior_text = None
-
         change_pct = None
-        if prior_text and following_text:
-            change_pct = _percentage_change(prior_text, following_text)
+        if following_val is not None:
+            if action == "purchased":
+                prior_val = following_val - shares
+            else:
+                prior_val = following_val + shares
+            change_pct = _percentage_change_f(prior_val, following_val)
 
         share_str = f"{shares:,.0f} shares" if shares is not None else "an undisclosed number of shares"
         price_str = f" at ${price:,.2f}" if price is not None else ""
@@ -354,7 +482,7 @@ class FilingAnalyzer:
         plain_text: str,
     ) -> str:
         item_info = event.submission_metadata.get("item-information", [])
-        sections = _extract_item_sections(plain_text)
+        sections = _extract_item_sections(plain_text, limit=3)
 
         summary_parts: List[str] = []
         if item_info:
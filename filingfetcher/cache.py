@@ -4,14 +4,22 @@ Simple JSON-based cache helpers.
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+try:  # Optional C-backed JSON serializer.
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 LOGGER = logging.getLogger(__name__)
 
+MAX_WEBHOOK_CHANNELS = 4096
+
 
 class DiscordThreadCache:
     """Persist Discord thread metadata to a JSON file without requiring a database."""
@@ -19,7 +27,7 @@ class DiscordThreadCache:
     def __init__(self, path: Path) -> None:
         self._path = path
         self._lock = threading.Lock()
-        self._data: Dict[str, Any] = {"channels": {}, "updated_at": None}
+        self._data: Dict[str, Any] = {"channels": {}, "webhook_channels": {}, "updated_at": None}
         self._load()
 
     @property
@@ -28,7 +36,24 @@ class DiscordThreadCache:
 
     def snapshot(self) -> Dict[str, Any]:
         with self._lock:
-            return json.loads(json.dumps(self._data))
+            return copy.deepcopy(self._data)
+
+    def webhook_channel(self, webhook_key: str) -> Optional[str]:
+        """Return the channel ID previously resolved for a webhook, if any."""
+        with self._lock:
+            return self._data.get("webhook_channels", {}).get(webhook_key)
+
+    def set_webhook_channel(self, webhook_key: str, channel_id: str) -> None:
+        """Remember the channel a webhook posts to, evicting the oldest entries past the cap."""
+        with self._lock:
+            mapping = self._data.setdefault("webhook_channels", {})
+            if mapping.get(webhook_key) == channel_id:
+                return
+            mapping.pop(webhook_key, None)
+            mapping[webhook_key] = channel_id
+            while len(mapping) > MAX_WEBHOOK_CHANNELS:
+                del mapping[next(iter(mapping))]
+            self._save_locked()
 
     def update(self, timestamp: str, payload: Dict[str, list]) -> None:
         with self._lock:
@@ -61,10 +86,10 @@ class DiscordThreadCache:
         try:
             if not self._path.is_file():
                 return
-            content = self._path.read_text(encoding="utf-8")
+            content = self._path.read_bytes()
             if not content.strip():
                 return
-            loaded = json.loads(content)
+            loaded = orjson.loads(content) if orjson else json.loads(content)
             if isinstance(loaded, dict):
                 self._data.update(loaded)
         except (OSError, json.JSONDecodeError) as exc:
@@ -78,9 +103,7 @@ class DiscordThreadCache:
         try:
             self._path.parent.mkdir(parents=True, exist_ok=True)
             tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
-            with tmp_path.open("w", encoding="utf-8") as handle:
-                json.dump(self._data, handle, ensure_ascii=True, indent=2)
-                handle.flush()
+            tmp_path.write_bytes(_dump_json(self._data))
             tmp_path.replace(self._path)
         except OSError as exc:
             LOGGER.warning(
@@ -88,3 +111,10 @@ class DiscordThreadCache:
                 self._path,
                 exc,
             )
+
+
+def _dump_json(data: Dict[str, Any]) -> bytes:
+    """Serialize compact newline-terminated JSON, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=True, separators=(",", ":")) + "\n").encode("utf-8")
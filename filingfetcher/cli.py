@@ -29,6 +29,13 @@ DEFAULT_USER_AGENT = os.environ.get("SEC_USER_AGENT", "FilingFetcher/0.1 (contac
 LOGGER = logging.getLogger(__name__)
 
 
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Monitor newly posted SEC filings and summarize them.")
     parser.add_argument(
@@ -85,6 +92,17 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=os.environ.get("FILINGFETCHER_LOGLEVEL", "INFO"),
         help="Python logging level (default: %(default)s)",
     )
+    parser.add_argument(
+        "--parallel-analysis",
+        action="store_true",
+        help="Parse and analyze each batch of new filings across process pools.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=8,
+        help="Concurrent filing downloads feeding the analyze/publish pipeline (default: %(default)s)",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -112,7 +130,7 @@ def main(argv: list[str] | None = None) -> int:
 
     exchanges = [exchange.strip() for exchange in args.exchanges.split(",") if exchange.strip()]
     metadata_repo = MetadataRepository()
-    fetcher = FilingContentFetcher(user_agent=args.user_agent)
+    fetcher = FilingContentFetcher(user_agent=args.user_agent, parse_in_subprocess=args.parallel_analysis)
     analyzer = FilingAnalyzer()
     discord_mode = "test" if args.test else args.discord_mode
 
@@ -136,6 +154,8 @@ def main(argv: list[str] | None = None) -> int:
         polling_interval_seconds=args.poll,
         validation_interval_seconds=args.validate,
         quiet=args.quiet,
+        parallel_analysis=args.parallel_analysis,
+        max_workers=args.workers,
     )
 
     bot_token = os.environ.get("DISCORD_BOT_TOKEN") or os.environ.get("DISCORD_API_TOKEN")
@@ -163,6 +183,9 @@ def main(argv: list[str] | None = None) -> int:
         monitor.start()
     finally:
         poller.stop()
+        monitor.stop()
+        if isinstance(reporter, DiscordReporter):
+            reporter.close()
         fetcher.close()
 
     return 0
@@ -4,25 +4,41 @@ Utilities for polling Discord forum channels for thread metadata.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
+import re
 import sys
 import threading
 import time
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Optional
 from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .cache import DiscordThreadCache
 
+try:  # Optional C-backed JSON serializer.
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 LOGGER = logging.getLogger(__name__)
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
+MAX_POLL_WORKERS = 16
+# Replaces the last path segment (the webhook token) of URLs with three or more segments,
+# ignoring trailing slashes and dropping any fragment.
+WEBHOOK_TOKEN_RE = re.compile(
+    r"^(?P<prefix>[^:/?#]+://[^/?#]*(?:/[^/?#]*){2,}?)/[^/?#]*/*(?:\?(?P<query>[^#]*))?(?:#.*)?$"
+)
+# Archived threads change rarely; walk their pagination only every N polls per channel.
+ARCHIVED_REFRESH_POLLS = 60
 
 
 class DiscordThreadPoller:
@@ -48,17 +64,30 @@ class DiscordThreadPoller:
             self._webhook_origins[cleaned_url] = cleaned_channel
         self._poll_interval_seconds = max(poll_interval_seconds, 1)
         self._bot_token = bot_token
+        self._headers = self._build_headers()
         self._session = requests.Session()
         self._session.headers.update({"User-Agent": "FilingFetcher-DiscordThreadPoller/1.0"})
+        # Webhooks are polled concurrently; size the pool so workers do not queue for connections.
+        self._session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._detail_executor: Optional[ThreadPoolExecutor] = None
+        self._last_payload_digest: Optional[bytes] = None
+        self._state_lock = threading.Lock()
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._channel_cache: Dict[str, str] = {}
+        # webhook URL -> (channel_id, fallback thread IDs), fixed once the channel resolves.
+        self._resolved_targets: Dict[str, tuple[str, tuple[str, ...]]] = {}
+        self._archived_snapshots: Dict[str, Dict[str, dict]] = {}
+        self._archived_walked_at: Dict[str, float] = {}
+        self._last_active_ids: Dict[str, frozenset] = {}
         self._stream = stream or sys.stdout
         self._initial_poll_done = False
         resolved_cache_path = self._resolve_cache_path(cache_path)
         self._cache = DiscordThreadCache(resolved_cache_path) if resolved_cache_path else None
         if self._cache:
             LOGGER.info("Discord thread cache path: %s", self._cache.path)
+            self._load_persisted_channels()
 
     def start(self) -> None:
         if not self._can_poll(log=not self._initial_poll_done):
@@ -83,6 +112,12 @@ class DiscordThreadPoller:
         thread = self._thread
         if thread and thread.is_alive():
             self._thread.join(timeout=self._poll_interval_seconds + 5)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._detail_executor:
+            self._detail_executor.shutdown(wait=False)
+            self._detail_executor = None
         self._session.close()
         if thread:
             LOGGER.info("Stopped Discord thread poller.")
@@ -131,6 +166,17 @@ class DiscordThreadPoller:
 
         return path.expanduser()
 
+    def _load_persisted_channels(self) -> None:
+        """Seed webhook → channel resolutions saved by a previous run."""
+        for url, configured_channel in self._webhooks.items():
+            if configured_channel:
+                continue
+            channel_id = self._cache.webhook_channel(_webhook_cache_key(url))
+            if channel_id:
+                self._channel_cache[url] = channel_id
+                if not self._webhook_origins.get(url):
+                    self._webhook_origins[url] = channel_id
+
     def _run_loop(self) -> None:
         while not self._stop_event.is_set():
             try:
@@ -142,11 +188,15 @@ class DiscordThreadPoller:
                 break
 
     def _emit_payload(self, payload: Dict) -> None:
-        timestamped = {
-            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-            "threads": payload,
-        }
-        json_output = json.dumps(timestamped, ensure_ascii=True)
+        threads_json = _encode_json_line(payload)
+        digest = hashlib.blake2b(threads_json.encode("ascii"), digest_size=16).digest()
+        if digest == self._last_payload_digest:
+            LOGGER.debug("Discord thread poll unchanged since last emit; skipping output and cache write.")
+            return
+        self._last_payload_digest = digest
+
+        timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        json_output = f'{{"timestamp":"{timestamp}","threads":{threads_json}}}'
         print(json_output, file=self._stream, flush=True)
         thread_count = sum(len(threads) for threads in payload.values())
         LOGGER.info(
@@ -156,20 +206,57 @@ class DiscordThreadPoller:
         )
         if self._cache:
             try:
-                self._cache.update(timestamped["timestamp"], payload)
+                self._cache.update(timestamp, payload)
             except Exception:  # pragma: no cover - defensive logging
                 LOGGER.exception("Failed to update Discord thread cache at %s", self._cache.path)
 
     def _gather_threads_payload(self) -> Dict[str, list]:
+        webhooks = list(self._webhooks.items())
+        if len(webhooks) > 1:
+            executor = self._get_executor(len(webhooks))
+            futures = [executor.submit(self._poll_one_webhook, url, channel) for url, channel in webhooks]
+            polled = [future.result() for future in futures]
+        else:
+            polled = [self._poll_one_webhook(url, channel) for url, channel in webhooks]
+
+        # Merge in webhook order so the payload matches a sequential poll.
         result: Dict[str, list] = {}
-        for url, configured_channel in self._webhooks.items():
-            channel_id = self._resolve_channel_id(url, configured_channel)
-            fallback_ids = self._collect_fallback_thread_ids(url, configured_channel)
-            key_id, threads = self._fetch_threads_for_channel(channel_id, fallback_ids)
+        for key_id, threads in polled:
             if key_id:
                 result[key_id] = threads
         return result
 
+    def _get_executor(self, webhook_count: int) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=min(MAX_POLL_WORKERS, webhook_count),
+                thread_name_prefix="DiscordThreadPollerWorker",
+            )
+        return self._executor
+
+    def _get_detail_executor(self) -> ThreadPoolExecutor:
+        # Kept apart from the webhook pool: webhook workers block on these lookups, so sharing
+        # one pool could exhaust it with waiters and deadlock.
+        with self._state_lock:
+            if self._detail_executor is None:
+                self._detail_executor = ThreadPoolExecutor(
+                    max_workers=MAX_POLL_WORKERS,
+                    thread_name_prefix="DiscordThreadDetailWorker",
+                )
+            return self._detail_executor
+
+    def _poll_one_webhook(self, url: str, configured_channel: Optional[str]) -> tuple[Optional[str], list]:
+        target = self._resolved_targets.get(url)
+        if target is None:
+            channel_id = self._resolve_channel_id(url, configured_channel)
+            fallback_ids = tuple(self._collect_fallback_thread_ids(url, configured_channel))
+            if channel_id:
+                with self._state_lock:
+                    self._resolved_targets[url] = (channel_id, fallback_ids)
+        else:
+            channel_id, fallback_ids = target
+        return self._fetch_threads_for_channel(channel_id, list(fallback_ids))
+
     def _resolve_channel_id(self, webhook_url: str, configured_channel: Optional[str]) -> Optional[str]:
         cached = self._channel_cache.get(webhook_url)
         if cached:
@@ -179,7 +266,8 @@ class DiscordThreadPoller:
         if configured_channel:
             resolved = self._resolve_configured_channel(configured_channel)
             if resolved:
-                self._channel_cache[webhook_url] = resolved
+                with self._state_lock:
+                    self._channel_cache[webhook_url] = resolved
                 return resolved
 
         try:
@@ -195,9 +283,12 @@ class DiscordThreadPoller:
             data = response.json()
             channel_id = data.get("channel_id")
             if channel_id:
-                self._channel_cache[webhook_url] = channel_id
-                if webhook_url not in self._webhook_origins or not self._webhook_origins[webhook_url]:
-                    self._webhook_origins[webhook_url] = channel_id
+                with self._state_lock:
+                    self._channel_cache[webhook_url] = channel_id
+                    if not self._webhook_origins.get(webhook_url):
+                        self._webhook_origins[webhook_url] = channel_id
+                if self._cache:
+                    self._cache.set_webhook_channel(_webhook_cache_key(webhook_url), channel_id)
             else:
                 LOGGER.warning(
                     "Discord webhook response missing channel_id: %s",
@@ -213,7 +304,7 @@ class DiscordThreadPoller:
         if not channel_id:
             return None
 
-        headers = self._build_headers()
+        headers = self._headers
         if not headers:
             return channel_id
 
@@ -266,8 +357,8 @@ class DiscordThreadPoller:
         channel_id: Optional[str],
         fallback_ids: list[str],
     ) -> tuple[Optional[str], list]:
-        headers = self._build_headers()
-        aggregated: Dict[str, dict] = OrderedDict()
+        headers = self._headers
+        aggregated: Dict[str, dict] = {}
 
         if channel_id and headers:
             endpoints = [
@@ -276,8 +367,15 @@ class DiscordThreadPoller:
             ]
 
             for endpoint, source in endpoints:
+                # Before the archived endpoint is reached, ``aggregated`` holds exactly the active threads.
+                if source == "public_archived" and not self._archived_walk_due(channel_id, aggregated):
+                    # Reuse the last full archived walk; live active entries take precedence.
+                    for thread_id, entry in self._archived_snapshots[channel_id].items():
+                        aggregated.setdefault(thread_id, entry)
+                    continue
                 url = endpoint
                 before: Optional[str] = None
+                archived_entries: Dict[str, dict] = {}
                 while True:
                     params = {"before": before} if before else None
                     try:
@@ -328,7 +426,7 @@ class DiscordThreadPoller:
                         if not thread_id:
                             continue
                         metadata = thread.get("thread_metadata") or {}
-                        aggregated[thread_id] = {
+                        entry = {
                             "thread_id": thread_id,
                             "name": thread.get("name"),
                             "archived": bool(metadata.get("archived")),
@@ -337,26 +435,50 @@ class DiscordThreadPoller:
                             "channel_id": channel_id,
                             "source": source,
                         }
+                        aggregated[thread_id] = entry
+                        if source == "public_archived":
+                            archived_entries[thread_id] = entry
 
                     has_more = data.get("has_more")
                     before = threads[-1]["id"] if has_more and threads else None
                     if not has_more:
                         break
 
+                if source == "public_archived":
+                    with self._state_lock:
+                        self._archived_snapshots[channel_id] = archived_entries
+                        self._archived_walked_at[channel_id] = time.monotonic()
+
+            with self._state_lock:
+                self._last_active_ids[channel_id] = frozenset(
+                    thread_id for thread_id, entry in aggregated.items() if entry["source"] == "active"
+                )
             self._ensure_fallback_threads(channel_id, aggregated, fallback_ids, headers)
             return channel_id, list(aggregated.values())
 
         return self._build_fallback_threads(channel_id, fallback_ids, headers)
 
+    def _archived_walk_due(self, channel_id: str, active_ids: Dict[str, dict]) -> bool:
+        walked_at = self._archived_walked_at.get(channel_id)
+        if walked_at is None or channel_id not in self._archived_snapshots:
+            return True
+        # A thread that left the active list since the last poll was most likely just archived;
+        # walk again so it does not vanish from the output until the next scheduled walk.
+        snapshot = self._archived_snapshots[channel_id]
+        for thread_id in self._last_active_ids.get(channel_id, ()):
+            if thread_id not in active_ids and thread_id not in snapshot:
+                return True
+        refresh_seconds = self._poll_interval_seconds * ARCHIVED_REFRESH_POLLS
+        return time.monotonic() - walked_at >= refresh_seconds
+
     def _build_fallback_threads(
         self,
         channel_id: Optional[str],
         fallback_ids: list[str],
         headers: Dict[str, str],
     ) -> tuple[Optional[str], list]:
-        fallback_map: Dict[str, dict] = OrderedDict()
-        for thread_id in fallback_ids:
-            details = self._fetch_thread_details(thread_id, headers, parent_channel_id=channel_id)
+        fallback_map: Dict[str, dict] = {}
+        for details in self._fetch_many_thread_details(fallback_ids, headers, parent_channel_id=channel_id):
             if details:
                 fallback_map[details["thread_id"]] = details
         key_id = channel_id or (fallback_ids[0] if fallback_ids else None)
@@ -369,19 +491,40 @@ class DiscordThreadPoller:
         fallback_ids: list[str],
         headers: Dict[str, str],
     ) -> None:
-        for thread_id in fallback_ids:
-            if not thread_id or thread_id == channel_id:
-                continue
-            if thread_id in aggregated:
-                continue
-            details = self._fetch_thread_details(
+        pending = [
+            thread_id
+            for thread_id in dict.fromkeys(fallback_ids)
+            if thread_id and thread_id != channel_id and thread_id not in aggregated
+        ]
+        for details in self._fetch_many_thread_details(
+            pending,
+            headers,
+            source="configured",
+            parent_channel_id=channel_id,
+        ):
+            if details and details["thread_id"] not in aggregated:
+                aggregated[details["thread_id"]] = details
+
+    def _fetch_many_thread_details(
+        self,
+        thread_ids: list[str],
+        headers: Dict[str, str],
+        *,
+        source: str = "fallback",
+        parent_channel_id: Optional[str] = None,
+    ) -> list[Optional[dict]]:
+        """Fetch details for several threads concurrently, returning results in input order."""
+        def fetch(thread_id: Optional[str]) -> Optional[dict]:
+            return self._fetch_thread_details(
                 thread_id,
                 headers,
-                source="configured",
-                parent_channel_id=channel_id,
+                source=source,
+                parent_channel_id=parent_channel_id,
             )
-            if details:
-                aggregated[details["thread_id"]] = details
+
+        if len(thread_ids) <= 1 or not headers:
+            return [fetch(thread_id) for thread_id in thread_ids]
+        return list(self._get_detail_executor().map(fetch, thread_ids))
 
     def _fetch_thread_details(
         self,
@@ -481,6 +624,11 @@ class DiscordThreadPoller:
 def _redact_webhook(webhook_url: str) -> str:
     if not webhook_url:
         return "<missing webhook>"
+    match = WEBHOOK_TOKEN_RE.match(webhook_url)
+    if match is not None:
+        return _redact_match(match)
+    # Non-canonical URLs (too few path segments, odd characters) take the general path so
+    # fragments and trailing slashes are still stripped.
     parsed = urlsplit(webhook_url)
     segments = parsed.path.rstrip("/").split("/")
     if len(segments) >= 4:
@@ -490,6 +638,16 @@ def _redact_webhook(webhook_url: str) -> str:
     return f"{parsed.scheme}://{parsed.netloc}{redacted_path}{query}"
 
 
+def _redact_match(match: re.Match) -> str:
+    query = match.group("query")
+    return f"{match.group('prefix')}/<redacted>" + (f"?{query}" if query else "")
+
+
+def _webhook_cache_key(webhook_url: str) -> str:
+    """Hash the webhook URL so its secret token is never written to the cache file."""
+    return hashlib.sha256(webhook_url.encode("utf-8")).hexdigest()
+
+
 def _normalize_token(token: str) -> str:
     token = token.strip()
     if not token:
@@ -497,3 +655,12 @@ def _normalize_token(token: str) -> str:
     if token.lower().startswith(("bot ", "bearer ")):
         return token
     return f"Bot {token}"
+
+
+def _encode_json_line(data: Dict) -> str:
+    """Serialize compact ASCII-only JSON, preferring orjson when installed."""
+    if orjson is not None:
+        encoded = orjson.dumps(data)
+        if encoded.isascii():
+            return encoded.decode("ascii")
+    return json.dumps(data, ensure_ascii=True, separators=(",", ":"))
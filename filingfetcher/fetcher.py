@@ -4,36 +4,191 @@ Helpers to retrieve and normalize SEC filings using secbrowser-related tooling.
 
 from __future__ import annotations
 
-import time
+import atexit
+import os
+import tempfile
+import threading
 import logging
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from email.utils import parsedate_to_datetime
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
 from datamule import format_accession
 from secsgml import parse_sgml_content_into_memory
 
 from .models import FilingDocument
+from .utils import get_process_pool
 
 LOGGER = logging.getLogger(__name__)
+SPOOL_CHUNK_BYTES = 1 << 16
+
+RATE_LIMIT_STATUSES = (403, 429)
+
+# One pooled session per User-Agent and retry policy, shared by every fetcher in the
+# process so that short-lived fetchers reuse warm TLS connections to sec.gov.
+_SHARED_SESSIONS: Dict[Tuple[Any, ...], requests.Session] = {}
+_SHARED_SESSIONS_LOCK = threading.Lock()
+
 
 
 class FilingFetchError(RuntimeError):
     """Raised when we cannot download or parse a filing."""
 
 
-def _decode_value(value):
+FetchResult = Tuple[Dict[str, Any], List[FilingDocument]]
+
+
+def _decode_bytes(value):
     if isinstance(value, bytes):
         return value.decode("utf-8", errors="ignore")
-    if isinstance(value, dict):
-        return {str(_decode_value(k)): _decode_value(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [_decode_value(item) for item in value]
     return value
 
 
+def _decode_value(value):
+    """
+    Decode bytes keys/values throughout parsed SGML metadata.
+
+    Dicts and lists are rewritten in place with an explicit stack rather than rebuilt
+    recursively; the parser output is freshly allocated, so nothing else aliases it.
+    """
+    if not isinstance(value, (dict, list)):
+        return _decode_bytes(value)
+
+    stack = [value]
+    push = stack.append
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if all(type(key) is str for key in node):
+                for key, item in node.items():
+                    if isinstance(item, bytes):
+                        node[key] = item.decode("utf-8", errors="ignore")
+                    elif isinstance(item, (dict, list)):
+                        push(item)
+                continue
+            # Keys must change, so re-insert every entry to keep the original order.
+            items = list(node.items())
+            node.clear()
+            for key, item in items:
+                if isinstance(item, bytes):
+                    item = item.decode("utf-8", errors="ignore")
+                elif isinstance(item, (dict, list)):
+                    push(item)
+                node[str(_decode_bytes(key))] = item
+        else:
+            for index, item in enumerate(node):
+                if isinstance(item, bytes):
+                    node[index] = item.decode("utf-8", errors="ignore")
+                elif isinstance(item, (dict, list)):
+                    push(item)
+    return value
+
+
+class _SecRetry(Retry):
+    """
+    urllib3 retry policy mirroring the SEC fair-access backoff.
+
+    Unlike the stock exponential backoff, the first retry already waits ``backoff_factor``
+    seconds; each further retry multiplies the wait by ``backoff_multiplier`` up to
+    ``backoff_cap``. A ``Retry-After`` header can lengthen the wait but never shorten it.
+    """
+
+    def __init__(self, *args, backoff_multiplier: float = 2.0, backoff_cap: float = 300, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.backoff_multiplier = backoff_multiplier
+        self.backoff_cap = backoff_cap
+
+    def new(self, **kwargs) -> "_SecRetry":
+        retry = super().new(**kwargs)
+        retry.backoff_multiplier = self.backoff_multiplier
+        retry.backoff_cap = self.backoff_cap
+        return retry
+
+    def get_backoff_time(self) -> float:
+        attempts = len(self.history)
+        if attempts == 0:
+            return 0
+        return float(min(self.backoff_factor * self.backoff_multiplier ** (attempts - 1), self.backoff_cap))
+
+    def get_retry_after(self, response) -> Optional[float]:
+        try:
+            retry_after = super().get_retry_after(response)
+        except InvalidHeader:
+            return None
+        if retry_after is None:
+            return None
+        return max(retry_after, self.get_backoff_time())
+
+    def increment(self, method=None, url=None, response=None, *args, **kwargs):
+        if response is not None and response.status in RATE_LIMIT_STATUSES:
+            LOGGER.warning("SEC rate limit encountered for %s (status %s).", url, response.status)
+        return super().increment(method, url, response, *args, **kwargs)
+
+
+def _get_shared_session(
+    user_agent: str,
+    max_retries: int,
+    backoff_seconds: float,
+    backoff_cap_seconds: float,
+    backoff_multiplier: float,
+) -> requests.Session:
+    """Return the process-wide session for this identity and retry policy, creating it on first use."""
+    key = (user_agent, max_retries, backoff_seconds, backoff_cap_seconds, backoff_multiplier)
+    with _SHARED_SESSIONS_LOCK:
+        session = _SHARED_SESSIONS.get(key)
+        if session is None:
+            # Only rate-limit statuses are retried; connection and read errors fail at once.
+            # ``max_retries`` counts requests, so a budget of 3 means 1 attempt + 2 retries.
+            retry = _SecRetry(
+                total=max(max_retries - 1, 0),
+                connect=0,
+                read=0,
+                other=0,
+                backoff_factor=backoff_seconds,
+                backoff_multiplier=backoff_multiplier,
+                backoff_cap=backoff_cap_seconds,
+                status_forcelist=RATE_LIMIT_STATUSES,
+                allowed_methods=("GET",),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry))
+            session.headers.update(
+                {
+                    "User-Agent": user_agent,
+                    "Accept-Encoding": "gzip, deflate",
+                }
+            )
+            atexit.register(session.close)
+            _SHARED_SESSIONS[key] = session
+        return session
+
+
+def _clean_field(descriptor: Dict[str, Any], key: str) -> str:
+    """Return a stripped string for a document descriptor field, '' when missing or empty."""
+    value = descriptor.get(key)
+    if not value:
+        return ""
+    if type(value) is str:
+        return value.strip()
+    return str(value).strip()
+
+
+def _parse_spool(spool_path: str) -> Tuple[Dict[str, Any], List[bytes]]:
+    """Parse a spooled SGML submission into (decoded metadata, document blobs)."""
+    submission_meta_raw, document_blobs = parse_sgml_content_into_memory(
+        filepath=spool_path, keep_filtered_metadata=True
+    )
+    return _decode_value(submission_meta_raw), document_blobs
+
+
 @dataclass
 class FilingContentFetcher:
     """Download raw SEC filings and expose their constituent documents."""
@@ -44,21 +199,67 @@ class FilingContentFetcher:
     backoff_seconds: int = 30
     backoff_cap_seconds: int = 300
     backoff_multiplier: float = 2.0
+    max_concurrent_fetches: int = 4
+    parse_in_subprocess: bool = False
 
     def __post_init__(self) -> None:
-        self._session = requests.Session()
-        self._session.headers.update(
-            {
-                "User-Agent": self.user_agent,
-                "Accept-Encoding": "gzip, deflate",
-            }
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._session = _get_shared_session(
+            self.user_agent,
+            self.max_retries,
+            self.backoff_seconds,
+            self.backoff_cap_seconds,
+            self.backoff_multiplier,
         )
 
     def close(self) -> None:
-        """Release HTTP resources."""
-        self._session.close()
+        """Release the download workers; the shared HTTP session is closed at interpreter exit."""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def fetch_many(
+        self,
+        targets: Sequence[Tuple[str, str]],
+    ) -> List[Union[FetchResult, FilingFetchError]]:
+        """
+        Download several filings concurrently.
+
+        Parameters
+        ----------
+        targets:
+            Sequence of (cik, accession) pairs, as accepted by :meth:`fetch`.
+
+        Returns one entry per target, in order: either the ``fetch`` result or the
+        ``FilingFetchError`` describing why that filing could not be retrieved.
+        At most ``max_concurrent_fetches`` downloads run at once to stay within
+        SEC fair-access limits.
+        """
+        if len(targets) <= 1 or self.max_concurrent_fetches <= 1:
+            return [self._fetch_or_error(cik, accession) for cik, accession in targets]
+        executor = self._get_executor()
+        futures = [executor.submit(self._fetch_or_error, cik, accession) for cik, accession in targets]
+        return [future.result() for future in futures]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(self.max_concurrent_fetches, 1),
+                thread_name_prefix="FilingContentFetcher",
+            )
+        return self._executor
+
+    def _fetch_or_error(self, cik: str, accession: str) -> Union[FetchResult, FilingFetchError]:
+        try:
+            return self.fetch(cik, accession)
+        except FilingFetchError as exc:
+            return exc
+        except Exception as exc:
+            error = FilingFetchError(f"Failed to fetch filing {accession} for CIK {cik}: {exc}")
+            error.__cause__ = exc
+            return error
 
-    def fetch(self, cik: str, accession: str) -> Tuple[Dict[str, Any], List[FilingDocument]]:
+    def fetch(self, cik: str, accession: str) -> FetchResult:
         """
         Download a filing and return (submission_metadata, documents).
 
@@ -86,76 +287,71 @@ class FilingContentFetcher:
         )
         LOGGER.debug("Fetching filing from %s", url)
 
-        attempt = 0
-        backoff = self.backoff_seconds
-        while True:
-            response = self._session.get(url, timeout=self.timeout)
-            if response.status_code in (429, 403):
-                attempt += 1
-                wait_seconds = self._calculate_wait_seconds(response, backoff)
-                LOGGER.warning(
-                    "SEC rate limit encountered for %s (status %s). Backing off for %ss.",
-                    accession_dash,
-                    response.status_code,
-                    wait_seconds,
-                )
-                time.sleep(wait_seconds)
-                if attempt >= self.max_retries:
-                    raise FilingFetchError(
-                        f"Exceeded retry attempts due to SEC rate limits for accession {accession_dash}."
-                    )
-                backoff = min(
-                    backoff * self.backoff_multiplier,
-                    self.backoff_cap_seconds,
-                )
-                continue
-
-            if not response.ok:
-                raise FilingFetchError(
-                    f"Failed to download filing {accession_dash} for CIK {cik}: "
-                    f"{response.status_code} {response.reason}"
-                )
-            break
+        # Rate-limit retries and backoff happen inside the session's urllib3 Retry policy.
+        try:
+            response = self._session.get(url, timeout=self.timeout, stream=True)
+        except requests.RequestException as exc:
+            raise FilingFetchError(f"Failed to download filing {accession_dash} for CIK {cik}: {exc}") from exc
+        if response.status_code in RATE_LIMIT_STATUSES:
+            response.close()
+            raise FilingFetchError(
+                f"Exceeded retry attempts due to SEC rate limits for accession {accession_dash}."
+            )
+        if not response.ok:
+            response.close()
+            raise FilingFetchError(
+                f"Failed to download filing {accession_dash} for CIK {cik}: "
+                f"{response.status_code} {response.reason}"
+            )
 
-        submission_meta_raw, document_blobs = parse_sgml_content_into_memory(
-            bytes_content=response.content, keep_filtered_metadata=True
-        )
-        submission_meta = _decode_value(submission_meta_raw)
+        # Spool the body to disk and let secsgml mmap it, so the full submission is never
+        # held in memory alongside the extracted documents.
+        spool_path = self._spool_response(response, accession_dash)
+        try:
+            submission_meta, document_blobs = self._parse(spool_path)
+        finally:
+            with suppress(OSError):
+                os.unlink(spool_path)
 
         documents: List[FilingDocument] = []
         doc_descriptors = submission_meta.get("documents", [])
+        descriptor_count = len(doc_descriptors)
         for idx, blob in enumerate(document_blobs):
-            descriptor = doc_descriptors[idx] if idx < len(doc_descriptors) else {}
+            descriptor = doc_descriptors[idx] if idx < descriptor_count else {}
             documents.append(
                 FilingDocument(
-                    type=str(descriptor.get("type", "") or "").strip(),
-                    sequence=str(descriptor.get("sequence", "") or "").strip(),
-                    filename=str(descriptor.get("filename", "") or "").strip(),
-                    description=str(descriptor.get("description", "") or "").strip() or None,
+                    type=_clean_field(descriptor, "type"),
+                    sequence=_clean_field(descriptor, "sequence"),
+                    filename=_clean_field(descriptor, "filename"),
+                    description=_clean_field(descriptor, "description") or None,
                     content=blob,
                 )
             )
 
         return submission_meta, documents
 
-    @staticmethod
-    def _calculate_wait_seconds(response: requests.Response, fallback: float) -> float:
-        retry_after = response.headers.get("Retry-After")
-        if not retry_after:
-            return fallback
-
-        retry_after = retry_after.strip()
-        if retry_after.isdigit():
-            return max(float(retry_after), fallback)
+    def _parse(self, spool_path: str) -> Tuple[Dict[str, Any], List[bytes]]:
+        """Parse a spooled submission, off the GIL in a worker process when enabled."""
+        if self.parse_in_subprocess:
+            try:
+                return get_process_pool().submit(_parse_spool, spool_path).result()
+            except BrokenProcessPool as exc:
+                LOGGER.warning("SGML parse pool unavailable (%s); parsing in-process.", exc)
+        return _parse_spool(spool_path)
 
+    @staticmethod
+    def _spool_response(response: requests.Response, accession_dash: str) -> str:
+        """Stream a response body into a temporary file and return its path."""
+        spool = tempfile.NamedTemporaryFile(prefix="filingfetcher-", suffix=".txt", delete=False)
         try:
-            retry_time = parsedate_to_datetime(retry_after)
-            if retry_time.tzinfo is None:
-                retry_time = retry_time.replace(tzinfo=timezone.utc)
-            delta = (retry_time - datetime.now(timezone.utc)).total_seconds()
-            if delta > 0:
-                return max(delta, fallback)
-        except (TypeError, ValueError):
-            pass
-
-        return fallback
+            with response, spool:
+                for chunk in response.iter_content(chunk_size=SPOOL_CHUNK_BYTES):
+                    spool.write(chunk)
+                size = spool.tell()
+            if size == 0:
+                raise FilingFetchError(f"Empty response body for accession {accession_dash}.")
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(spool.name)
+            raise
+        return spool.name
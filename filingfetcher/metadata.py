@@ -5,20 +5,61 @@ Utilities for loading and querying company metadata supplied by secbrowser/datam
 from __future__ import annotations
 
 import ast
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, Iterable, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Optional
 
 from datamule import load_package_dataset
 
 from .models import CompanyProfile
 
+try:  # Optional C-backed JSON parser.
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+LOGGER = logging.getLogger(__name__)
+
+METADATA_CACHE_PATH = Path.home() / ".filingfetcher" / "metadata_repo.pkl"
+METADATA_CACHE_VERSION = 4
+# datamule has no public API for where load_package_dataset keeps its CSVs; it hardcodes
+# ~/.datamule/datasets (datamule.datasets._get_dataset). Override when that layout differs.
+DATASET_DIR = Path(os.environ.get("FILINGFETCHER_DATASET_DIR") or Path.home() / ".datamule" / "datasets")
+FINGERPRINT_SAMPLE_BYTES = 1 << 16
+
+_ASCII_NON_DIGITS = str.maketrans("", "", "".join(chr(code) for code in range(128) if not chr(code).isdigit()))
+
+
+def _loads_json(value: str):
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def _parse_list_literal(value: str):
+    """Parse a Python list literal, trying a JSON fast path before ``ast.literal_eval``."""
+    if value[:1] == "[" and '"' not in value and "\\" not in value:
+        try:
+            return _loads_json(value.replace("'", '"'))
+        except ValueError:
+            pass
+    return ast.literal_eval(value)
+
 
 def _safe_eval_list(value: Optional[str]) -> list[str]:
     """Parse a string that stores a Python-style list, returning [] when parsing fails."""
     if not value:
         return []
     try:
-        parsed = ast.literal_eval(value)
+        parsed = _parse_list_literal(value)
     except (ValueError, SyntaxError):
         return []
     if isinstance(parsed, (list, tuple, set)):
@@ -28,46 +69,136 @@ def _safe_eval_list(value: Optional[str]) -> list[str]:
     return []
 
 
+@lru_cache(maxsize=16384)
 def _normalize_cik(value: str) -> Optional[str]:
     """Normalize the provided CIK string into a canonical numeric string."""
-    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    # Feeds mostly supply canonical CIKs already: plain ASCII digits or positive ints.
+    if type(value) is str:
+        if value.isdigit() and value.isascii() and value[0] != "0":
+            return value
+    elif type(value) is int and value > 0:
+        return str(value)
+    digits = str(value).translate(_ASCII_NON_DIGITS)
+    if not digits.isascii():
+        digits = "".join(ch for ch in digits if ch.isdigit())
     return digits.lstrip("0") or digits or None
 
 
+def _dataset_fingerprint(dataset_name: str) -> Optional[str]:
+    """Hash the on-disk dataset's size, mtime and head/tail bytes without parsing any rows."""
+    path = DATASET_DIR / f"{dataset_name}.csv"
+    try:
+        stat = path.stat()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{METADATA_CACHE_VERSION}:{dataset_name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        with path.open("rb") as handle:
+            digest.update(handle.read(FINGERPRINT_SAMPLE_BYTES))
+            if stat.st_size > FINGERPRINT_SAMPLE_BYTES:
+                handle.seek(-FINGERPRINT_SAMPLE_BYTES, os.SEEK_END)
+                digest.update(handle.read())
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
 @dataclass
 class MetadataRepository:
     """In-memory cache of metadata keyed by CIK."""
 
     dataset_name: str = "listed_filer_metadata"
+    cache_path: Optional[Path] = METADATA_CACHE_PATH
 
     def __post_init__(self) -> None:
         self._by_cik: Dict[str, CompanyProfile] = {}
-        self._load()
+        self._by_exchange: Dict[str, List[CompanyProfile]] = {}
+        self._listed_ciks: Dict[FrozenSet[str], FrozenSet[str]] = {}
+        fingerprint = _dataset_fingerprint(self.dataset_name) if self.cache_path else None
+        if not (fingerprint and self._load_cached(fingerprint)):
+            self._load()
+            if self.cache_path:
+                # datamule downloads the dataset on first use, so a missing file is only a
+                # problem once the rows have been loaded.
+                fingerprint = fingerprint or _dataset_fingerprint(self.dataset_name)
+                if fingerprint:
+                    self._store_cached(fingerprint)
+                else:
+                    LOGGER.warning(
+                        "Cannot fingerprint dataset %s under %s; the metadata cache is disabled. "
+                        "Set FILINGFETCHER_DATASET_DIR to datamule's dataset directory.",
+                        self.dataset_name,
+                        DATASET_DIR,
+                    )
+        self._build_indexes()
+
+    def _load_cached(self, fingerprint: str) -> bool:
+        """Restore profiles from the pickle cache when it matches the dataset fingerprint."""
+        try:
+            with open(self.cache_path, "rb") as handle:
+                cached = pickle.load(handle)
+        except FileNotFoundError:
+            return False
+        except Exception as exc:  # pragma: no cover - corrupt or incompatible cache
+            LOGGER.warning("Ignoring unreadable metadata cache %s: %s", self.cache_path, exc)
+            return False
+        if not isinstance(cached, dict) or cached.get("hash") != fingerprint:
+            return False
+        self._by_cik = cached["by_cik"]
+        return True
+
+    def _store_cached(self, fingerprint: Optional[str]) -> None:
+        """Pickle the parsed profiles so the next startup can skip the CSV parse."""
+        if not fingerprint:
+            return
+        path = Path(self.cache_path)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as handle:
+                pickle.dump({"hash": fingerprint, "by_cik": self._by_cik}, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(path)
+        except OSError as exc:
+            LOGGER.warning("Failed to write metadata cache %s: %s", path, exc)
 
     def _load(self) -> None:
         """Populate the metadata cache."""
         rows = load_package_dataset(self.dataset_name)
+        # Bind the per-row helpers locally; this loop runs once per listed filer.
+        normalize_cik = _normalize_cik
+        parse_list = _safe_eval_list
+        intern = sys.intern
+        by_cik = self._by_cik
         for row in rows:
-            cik = _normalize_cik(row.get("cik"))
+            get = row.get
+            cik = normalize_cik(get("cik"))
             if not cik:
                 continue
+            cik = intern(cik)
 
-            exchanges = _safe_eval_list(row.get("exchanges"))
-            tickers = _safe_eval_list(row.get("tickers") or row.get("ticker"))
-
-            profile = CompanyProfile(
+            by_cik[cik] = CompanyProfile(
                 cik=cik,
-                name=(row.get("name") or row.get("companyName") or "").strip() or None,
-                tickers=tickers,
-                exchanges=exchanges,
-                category=(row.get("category") or "").strip() or None,
-                sic=(row.get("sic") or "").strip() or None,
-                description=(row.get("description") or "").strip() or None,
+                name=(get("name") or get("companyName") or "").strip() or None,
+                tickers=tuple(parse_list(get("tickers") or get("ticker"))),
+                # A handful of exchange names repeat across every row; share one string each.
+                exchanges=tuple(map(intern, parse_list(get("exchanges")))),
+                category=(get("category") or "").strip() or None,
+                sic=(get("sic") or "").strip() or None,
+                description=(get("description") or "").strip() or None,
             )
-            self._by_cik[cik] = profile
+
+    def _build_indexes(self) -> None:
+        """Bucket profiles by upper-cased exchange for inverted lookups."""
+        by_exchange: Dict[str, List[CompanyProfile]] = defaultdict(list)
+        for profile in self._by_cik.values():
+            for exchange in {exchange.upper() for exchange in profile.exchanges}:
+                by_exchange[exchange].append(profile)
+        self._by_exchange = dict(by_exchange)
 
     def get(self, cik: str) -> Optional[CompanyProfile]:
         """Return company info for a given CIK if available."""
+        # Keys are canonical CIKs, so an exact hit needs no normalization.
+        profile = self._by_cik.get(cik)
+        if profile is not None:
+            return profile
         key = _normalize_cik(cik)
         if not key:
             return None
@@ -76,21 +207,30 @@ class MetadataRepository:
     def exchanges_for(self, cik: str) -> list[str]:
         """Return the exchanges for the provided CIK."""
         profile = self.get(cik)
-        return profile.exchanges if profile else []
+        return list(profile.exchanges) if profile else []
 
     def tickers_for(self, cik: str) -> list[str]:
         """Return the tickers for the provided CIK."""
         profile = self.get(cik)
-        return profile.tickers if profile else []
+        return list(profile.tickers) if profile else []
+
+    def any_listed_on(self, ciks: Iterable[str], exchanges: AbstractSet[str]) -> bool:
+        """Return True when any CIK trades on one of the upper-cased ``exchanges``."""
+        key = frozenset(exchanges)
+        listed = self._listed_ciks.get(key)
+        if listed is None:
+            listed = frozenset(
+                profile.cik for exchange in key for profile in self._by_exchange.get(exchange, ())
+            )
+            self._listed_ciks[key] = listed
+        return any(cik in listed or _normalize_cik(cik) in listed for cik in ciks)
 
     def filter_by_exchanges(self, ciks: Iterable[str], exchanges: Iterable[str]) -> list[CompanyProfile]:
         """Return company profiles whose listings intersect with target exchanges."""
-        target = {exchange.upper() for exchange in exchanges}
+        target = frozenset(exchange.upper() for exchange in exchanges)
         matches = []
         for cik in ciks:
             profile = self.get(cik)
-            if not profile:
-                continue
-            if profile.belongs_to_exchanges(target):
+            if profile is not None and profile.belongs_to_normalized_exchanges(target):
                 matches.append(profile)
         return matches
@@ -4,30 +4,43 @@ Core dataclasses used by the FilingFetcher application.
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional
+from functools import lru_cache
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
+# Slotted dataclasses need Python 3.10+; older interpreters fall back to a regular __dict__.
+# Slotted models cannot take ad-hoc attributes; subclasses must declare their own __slots__.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class CompanyProfile:
     """Normalized metadata for a single company identifier."""
 
     cik: str
     name: Optional[str] = None
-    tickers: List[str] = field(default_factory=list)
-    exchanges: List[str] = field(default_factory=list)
+    tickers: Tuple[str, ...] = ()
+    exchanges: Tuple[str, ...] = ()
     category: Optional[str] = None
     sic: Optional[str] = None
     description: Optional[str] = None
+    _exchanges_upper: FrozenSet[str] = field(init=False, repr=False, compare=False, default=frozenset())
+
+    def __post_init__(self) -> None:
+        self._exchanges_upper = frozenset(exchange.upper() for exchange in self.exchanges)
 
     def belongs_to_exchanges(self, target: Iterable[str]) -> bool:
         """Return True when company trades on at least one of the target exchanges."""
-        target_upper = {ex.upper() for ex in target}
-        return any(exchange.upper() in target_upper for exchange in self.exchanges)
+        return self.belongs_to_normalized_exchanges({ex.upper() for ex in target})
+
+    def belongs_to_normalized_exchanges(self, target_upper: AbstractSet[str]) -> bool:
+        """Like ``belongs_to_exchanges`` for a set whose names are already upper-cased."""
+        return not self._exchanges_upper.isdisjoint(target_upper)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FilingDocument:
     """Represents a single document contained within an SEC submission."""
 
@@ -42,7 +55,7 @@ class FilingDocument:
         return self.content.decode(encoding, errors="ignore")
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FilingEvent:
     """Normalized payload emitted when a new filing is detected."""
 
@@ -58,30 +71,32 @@ class FilingEvent:
 
     def normalized_cik(self) -> str:
         """Return the CIK with leading zeros removed (or original if all zeros)."""
-        stripped = self.cik.lstrip("0")
-        return stripped or self.cik
+        return _filing_identifiers(self.cik, self.accession)[0]
 
     def accession_no_dashes(self) -> str:
         """Return accession number without dash separators."""
-        return self.accession.replace("-", "")
+        return _filing_identifiers(self.cik, self.accession)[1]
 
     def sec_txt_url(self) -> str:
         """Return the canonical SEC URL for the raw submission text."""
-        acc_no_dash = self.accession_no_dashes()
-        cik_component = self.normalized_cik()
-        return (
-            f"https://www.sec.gov/Archives/edgar/data/{cik_component}/"
-            f"{acc_no_dash}/{self.accession}.txt"
-        )
+        return _filing_identifiers(self.cik, self.accession)[3]
 
     def sec_archive_base_url(self) -> str:
         """Return the base SEC archive URL for documents in this submission."""
-        acc_no_dash = self.accession_no_dashes()
-        cik_component = self.normalized_cik()
-        return f"https://www.sec.gov/Archives/edgar/data/{cik_component}/{acc_no_dash}/"
+        return _filing_identifiers(self.cik, self.accession)[2]
+
+
+# Keyed on the source values, so reassigning FilingEvent.cik/accession can never leave stale URLs.
+@lru_cache(maxsize=1024)
+def _filing_identifiers(cik: str, accession: str) -> Tuple[str, str, str, str]:
+    """Return (stripped CIK, accession without dashes, archive base URL, .txt URL)."""
+    cik_stripped = cik.lstrip("0") or cik
+    acc_no_dash = accession.replace("-", "")
+    archive_base = f"https://www.sec.gov/Archives/edgar/data/{cik_stripped}/{acc_no_dash}/"
+    return cik_stripped, acc_no_dash, archive_base, f"{archive_base}{accession}.txt"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AnalysisResult:
     """Structured output produced by the analyzer."""
 
@@ -5,19 +5,43 @@ Monitoring loop that relies on secbrowser/datamule to surface live SEC filings.
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 from datamule import Portfolio, format_accession
 
 from .analysis import FilingAnalyzer
 from .fetcher import FilingContentFetcher, FilingFetchError
 from .metadata import MetadataRepository
-from .models import CompanyProfile, FilingEvent
+from .models import CompanyProfile, FilingDocument, FilingEvent
 from .reporters import Reporter
+from .utils import shutdown_process_pool
 
 LOGGER = logging.getLogger(__name__)
 
+# Queue sentinel that tells a pipeline stage to exit.
+_PIPELINE_STOP = object()
+# How long stop() waits for in-flight submissions before abandoning the (daemon) stage threads.
+STOP_TIMEOUT_SECONDS = 10.0
+
+
+def _is_sorted_unique(values: Sequence[str]) -> bool:
+    """Return True when ``values`` is strictly increasing (sorted with no duplicates)."""
+    return all(left < right for left, right in zip(values, values[1:]))
+
+
+@dataclass
+class _SubmissionTarget:
+    """A submission that passed the exchange filter and is ready to be fetched."""
+
+    accession: str
+    cik: str
+    company: CompanyProfile
+
 
 class FilingMonitor:
     """Continuously monitor EDGAR for new submissions and emit analyses."""
@@ -33,13 +57,25 @@ class FilingMonitor:
         polling_interval_seconds: int,
         validation_interval_seconds: int,
         quiet: bool = True,
+        parallel_analysis: bool = False,
+        max_workers: int = 8,
     ) -> None:
         self.metadata = metadata_repository or MetadataRepository()
         self.fetcher = fetcher
         self.analyzer = analyzer
         self.reporter = reporter
         self.target_exchanges = list(target_exchanges)
+        self._target_upper = frozenset(exchange.upper() for exchange in self.target_exchanges)
         self.quiet = quiet
+        self.parallel_analysis = parallel_analysis
+        self.max_workers = max(max_workers, 1)
+        self._pipeline_lock = threading.Lock()
+        self._fetch_queue: Optional[queue.Queue] = None
+        self._analyze_queue: Optional[queue.Queue] = None
+        self._publish_queue: Optional[queue.Queue] = None
+        self._fetch_threads: List[threading.Thread] = []
+        self._analyze_thread: Optional[threading.Thread] = None
+        self._publish_thread: Optional[threading.Thread] = None
 
         self._portfolio = Portfolio(portfolio_path)
         self._polling_interval_ms = max(polling_interval_seconds, 1) * 1000
@@ -59,31 +95,218 @@ class FilingMonitor:
             quiet=self.quiet,
         )
 
+    def stop(self, timeout: float = STOP_TIMEOUT_SECONDS) -> None:
+        """
+        Stop the pipeline threads and the shared parse/analysis process pool.
+
+        Submissions still waiting to be fetched are dropped; filings already being fetched get
+        up to ``timeout`` seconds to finish analysis and publishing. Stage threads still busy
+        after that (e.g. sleeping through SEC retry backoff) are daemons and are abandoned.
+        """
+        self._stop_pipeline(timeout)
+        shutdown_process_pool()
+
+    def _stop_pipeline(self, timeout: float) -> None:
+        with self._pipeline_lock:
+            if not self._fetch_threads:
+                return
+            deadline = time.monotonic() + timeout
+            dropped = 0
+            while True:
+                try:
+                    self._fetch_queue.get_nowait()
+                except queue.Empty:
+                    break
+                dropped += 1
+            if dropped:
+                LOGGER.info("Discarding %d queued submission(s) on shutdown.", dropped)
+            for _ in self._fetch_threads:
+                self._fetch_queue.put(_PIPELINE_STOP)
+            for thread in self._fetch_threads:
+                thread.join(max(deadline - time.monotonic(), 0))
+            # The analyze stage forwards the sentinel to the publish stage once drained.
+            try:
+                self._analyze_queue.put(_PIPELINE_STOP, timeout=max(deadline - time.monotonic(), 0))
+            except queue.Full:
+                pass
+            self._analyze_thread.join(max(deadline - time.monotonic(), 0))
+            self._publish_thread.join(max(deadline - time.monotonic(), 0))
+            stages = (*self._fetch_threads, self._analyze_thread, self._publish_thread)
+            busy = [thread.name for thread in stages if thread.is_alive()]
+            if busy:
+                LOGGER.warning("Abandoning pipeline threads still busy after %ss: %s", timeout, ", ".join(busy))
+            self._fetch_threads = []
+            self._analyze_thread = self._publish_thread = None
+
     # --------------------------------------------------------------------- #
     # Internal helpers
     # --------------------------------------------------------------------- #
     def _on_new_submissions(self, submissions: List[dict]) -> None:
+        if self.parallel_analysis:
+            self._process_batch(submissions)
+            return
+        if self.max_workers <= 1:
+            for submission in submissions:
+                self._safe_process(submission)
+            return
+        self._ensure_pipeline()
         for submission in submissions:
             try:
-                self._process_submission(submission)
+                target = self._resolve_target(submission)
             except Exception as exc:  # pragma: no cover - defensive logging
                 LOGGER.exception("Failed to process submission %s: %s", submission, exc)
+                continue
+            if target is not None:
+                self._fetch_queue.put((submission, target))
+
+    # ---- fetch -> analyze -> publish pipeline ---- #
+    def _ensure_pipeline(self) -> None:
+        """
+        Start the stage threads on first use; analyze/publish queues are bounded for backpressure.
+
+        Filings are published in the order their downloads complete, which may differ from
+        submission order when several fetches are in flight.
+        """
+        with self._pipeline_lock:
+            if self._fetch_threads:
+                return
+            self._fetch_queue = queue.Queue()
+            self._analyze_queue = queue.Queue(maxsize=self.max_workers)
+            self._publish_queue = queue.Queue(maxsize=self.max_workers)
+            # Never exceed the fetcher's concurrent-download cap (SEC fair-access guidance).
+            fetch_workers = max(min(self.max_workers, self.fetcher.max_concurrent_fetches), 1)
+            self._fetch_threads = [
+                threading.Thread(target=self._fetch_stage, name=f"FilingMonitorFetch-{index}", daemon=True)
+                for index in range(fetch_workers)
+            ]
+            self._analyze_thread = threading.Thread(
+                target=self._analyze_stage, name="FilingMonitorAnalyze", daemon=True
+            )
+            self._publish_thread = threading.Thread(
+                target=self._publish_stage, name="FilingMonitorPublish", daemon=True
+            )
+            for thread in (*self._fetch_threads, self._analyze_thread, self._publish_thread):
+                thread.start()
+
+    def _fetch_stage(self) -> None:
+        while True:
+            item = self._fetch_queue.get()
+            if item is _PIPELINE_STOP:
+                return
+            submission, target = item
+            try:
+                submission_meta, documents = self.fetcher.fetch(target.cik, target.accession)
+            except FilingFetchError as exc:
+                LOGGER.warning(str(exc))
+                continue
+            except Exception as exc:  # pragma: no cover - defensive logging
+                LOGGER.exception("Failed to fetch accession %s: %s", target.accession, exc)
+                continue
+            self._analyze_queue.put(self._make_event(submission, target, submission_meta, documents))
+
+    def _analyze_stage(self) -> None:
+        while True:
+            event = self._analyze_queue.get()
+            if event is _PIPELINE_STOP:
+                self._publish_queue.put(_PIPELINE_STOP)
+                return
+            try:
+                analysis = self.analyzer.analyze(event)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                LOGGER.exception("Failed to analyze accession %s: %s", event.accession, exc)
+                continue
+            self._publish_queue.put((event, analysis))
+
+    def _publish_stage(self) -> None:
+        while True:
+            item = self._publish_queue.get()
+            if item is _PIPELINE_STOP:
+                return
+            event, analysis = item
+            try:
+                self.reporter.publish(event, analysis)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                LOGGER.exception("Failed to publish accession %s: %s", event.accession, exc)
+
+    def _safe_process(self, submission: dict) -> None:
+        try:
+            self._process_submission(submission)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            LOGGER.exception("Failed to process submission %s: %s", submission, exc)
 
     def _process_submission(self, submission: dict) -> None:
+        event = self._build_event(submission)
+        if event is None:
+            return
+        analysis = self.analyzer.analyze(event)
+        self.reporter.publish(event, analysis)
+
+    def _process_batch(self, submissions: List[dict]) -> None:
+        """Fetch every submission concurrently, analyze the batch in parallel, then publish in order."""
+        targets: List[Tuple[dict, _SubmissionTarget]] = []
+        for submission in submissions:
+            try:
+                target = self._resolve_target(submission)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                LOGGER.exception("Failed to process submission %s: %s", submission, exc)
+                continue
+            if target is not None:
+                targets.append((submission, target))
+
+        fetched = self.fetcher.fetch_many(
+            [(target.cik, target.accession) for _, target in targets]
+        )
+
+        events: List[FilingEvent] = []
+        for (submission, target), result in zip(targets, fetched):
+            if isinstance(result, FilingFetchError):
+                LOGGER.warning(str(result))
+                continue
+            submission_meta, documents = result
+            events.append(self._make_event(submission, target, submission_meta, documents))
+
+        try:
+            analyses = self.analyzer.analyze_many(events)
+        except Exception:  # pragma: no cover - defensive logging
+            LOGGER.exception("Batch analysis failed; analyzing %d filing(s) serially.", len(events))
+            analyses = [None] * len(events)
+
+        for event, analysis in zip(events, analyses):
+            try:
+                if analysis is None:
+                    analysis = self.analyzer.analyze(event)
+                self.reporter.publish(event, analysis)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                LOGGER.exception("Failed to process accession %s: %s", event.accession, exc)
+
+    def _build_event(self, submission: dict) -> Optional[FilingEvent]:
+        """Resolve metadata and download the filing, returning None when it should be skipped."""
+        target = self._resolve_target(submission)
+        if target is None:
+            return None
+
+        try:
+            submission_meta, documents = self.fetcher.fetch(target.cik, target.accession)
+        except FilingFetchError as exc:
+            LOGGER.warning(str(exc))
+            return None
+
+        return self._make_event(submission, target, submission_meta, documents)
+
+    def _resolve_target(self, submission: dict) -> Optional[_SubmissionTarget]:
+        """Match a submission to listed companies, returning None when none are on target exchanges."""
         accession_dash = format_accession(submission["accession"], "dash")
         cik_list = submission.get("ciks", [])
 
-        company_profiles = [
-            self.metadata.get(cik)
-            for cik in cik_list
-            if self.metadata.get(cik) is not None
-        ]
-
-        company_profiles = [
-            profile
-            for profile in company_profiles
-            if profile and profile.belongs_to_exchanges(self.target_exchanges)
-        ]
+        # Most EDGAR submissions come from unlisted filers; reject them with one set probe per CIK.
+        if self.metadata.any_listed_on(cik_list, self._target_upper):
+            company_profiles = [
+                profile
+                for profile in map(self.metadata.get, cik_list)
+                if profile is not None and profile.belongs_to_normalized_exchanges(self._target_upper)
+            ]
+        else:
+            company_profiles = []
 
         if not company_profiles:
             LOGGER.debug(
@@ -91,40 +314,50 @@ class FilingMonitor:
                 accession_dash,
                 self.target_exchanges,
             )
-            return
+            return None
 
         company_profile = self._merge_profiles(company_profiles)
         primary_cik = cik_list[0] if cik_list else company_profile.cik
+        return _SubmissionTarget(accession=accession_dash, cik=primary_cik, company=company_profile)
 
-        try:
-            submission_meta, documents = self.fetcher.fetch(primary_cik, accession_dash)
-        except FilingFetchError as exc:
-            LOGGER.warning(str(exc))
-            return
-
-        event = FilingEvent(
-            accession=accession_dash,
-            cik=primary_cik,
+    @staticmethod
+    def _make_event(
+        submission: dict,
+        target: _SubmissionTarget,
+        submission_meta: dict,
+        documents: List[FilingDocument],
+    ) -> FilingEvent:
+        return FilingEvent(
+            accession=target.accession,
+            cik=target.cik,
             submission_type=submission.get("submission_type", ""),
             filing_date=submission.get("filing_date"),
             received_at=datetime.now(timezone.utc),
-            company=company_profile,
+            company=target.company,
             documents=documents,
             submission_metadata=submission_meta,
             rss_metadata=submission,
         )
 
-        analysis = self.analyzer.analyze(event)
-        self.reporter.publish(event, analysis)
-
     @staticmethod
     def _merge_profiles(profiles: List[CompanyProfile]) -> CompanyProfile:
         primary = profiles[0]
         if len(profiles) == 1:
             return primary
+        # Co-registrants usually share one listing; reuse it when it is already in merged form.
+        if (
+            _is_sorted_unique(primary.tickers)
+            and _is_sorted_unique(primary.exchanges)
+            and all(
+                profile.tickers == primary.tickers and profile.exchanges == primary.exchanges
+                for profile in profiles[1:]
+            )
+        ):
+            return primary
 
-        tickers = sorted({ticker for profile in profiles for ticker in profile.tickers})
-        exchanges = sorted({exchange for profile in profiles for exchange in profile.exchanges})
+        # Output order is user-visible (reporters join the tickers), so keep the sort.
+        tickers = tuple(sorted(set().union(*(profile.tickers for profile in profiles))))
+        exchanges = tuple(sorted(set().union(*(profile.exchanges for profile in profiles))))
 
         merged = CompanyProfile(
             cik=primary.cik,
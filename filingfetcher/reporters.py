@@ -2,22 +2,32 @@
 
 from __future__ import annotations
 
+import codecs
 import json
 import logging
 import os
+import re
 import sys
-from copy import deepcopy
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from functools import lru_cache
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Dict, Optional, Protocol, TextIO, Any
+from typing import Any, Dict, List, Optional, Protocol, TextIO, Tuple
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .models import AnalysisResult, FilingDocument, FilingEvent
 
+try:  # Optional C-backed JSON serializer.
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 LOGGER = logging.getLogger(__name__)
 DEFAULT_USER_AGENT = os.environ.get("SEC_USER_AGENT", "FilingFetcher/0.1 (contact@example.com)")
 EDGAR_XSL_MAP = {
@@ -37,6 +47,35 @@ EDGAR_XSL_MAP = {
     "DEF 14A": [None],
     "SD": [None],
 }
+INDEX_SCAN_LIMIT = 200_000
+INDEX_CHUNK_SIZE = 16_384
+# After the first link is found, read at most this much more of the page so the keep-alive
+# connection can go back to the pool; larger leftovers just drop the connection.
+INDEX_DRAIN_LIMIT = 1_000_000
+HTML_SUFFIXES = (".htm", ".html")
+# One `left => right` mapping per line, skipping lines whose first non-blank character is '#'.
+WEBHOOK_LINE_RE = re.compile(r"^[^\S\n]*(?![#\s])(.*?)=>(.*)$", re.MULTILINE)
+
+
+_SEC_SESSION: Optional[requests.Session] = None
+_SEC_SESSION_LOCK = threading.Lock()
+
+DEFAULT_DOCUMENT_CACHE_SIZE = 1024
+_DEFAULT_DOCUMENT_URLS: Dict[str, str] = {}
+_DEFAULT_DOCUMENT_URLS_LOCK = threading.Lock()
+
+
+def _get_sec_session() -> requests.Session:
+    """Return the pooled session used for EDGAR index lookups, creating it on first use."""
+    global _SEC_SESSION
+    with _SEC_SESSION_LOCK:
+        if _SEC_SESSION is None:
+            retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+            session.headers.update({"User-Agent": DEFAULT_USER_AGENT})
+            _SEC_SESSION = session
+        return _SEC_SESSION
 
 
 class Reporter(Protocol):
@@ -51,11 +90,13 @@ class ConsoleReporter:
     """Write structured JSON updates to a text stream (default stdout)."""
 
     stream: TextIO = field(default_factory=lambda: sys.stdout)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     def publish(self, event: FilingEvent, analysis: AnalysisResult) -> None:
         payload = _build_filing_payload(event, analysis)
-        json_output = json.dumps(payload, ensure_ascii=True, indent=2, default=str)
-        print(json_output, file=self.stream, flush=True)
+        json_output = _dumps_ascii(payload, indent=True)
+        with self._lock:
+            print(json_output, file=self.stream, flush=True)
 
 
 @dataclass
@@ -63,12 +104,33 @@ class JsonReporter:
     """Emit newline-delimited JSON objects to the provided stream."""
 
     stream: TextIO = field(default_factory=lambda: sys.stdout)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     def publish(self, event: FilingEvent, analysis: AnalysisResult) -> None:
         payload = _build_filing_payload(event, analysis)
-        json.dump(payload, self.stream, ensure_ascii=True, default=str)
-        self.stream.write("\n")
-        self.stream.flush()
+        json_output = _dumps_ascii(payload)
+        # Publishers may run on several monitor workers; keep each line intact.
+        with self._lock:
+            self.stream.write(json_output + "\n")
+            self.stream.flush()
+
+
+def _dumps_ascii(payload: Dict[str, Any], indent: bool = False) -> str:
+    """Serialize ASCII-only JSON (stringifying unknown types), preferring orjson when installed."""
+    if orjson is not None:
+        # Route datetimes and dataclasses through default=str, as the json fallback does.
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            encoded = orjson.dumps(payload, default=str, option=option)
+        except TypeError:
+            encoded = None
+        if encoded is not None and encoded.isascii():
+            return encoded.decode("ascii")
+    if indent:
+        return json.dumps(payload, ensure_ascii=True, indent=2, default=str)
+    return json.dumps(payload, ensure_ascii=True, default=str)
 
 
 def _build_filing_payload(event: FilingEvent, analysis: AnalysisResult) -> Dict[str, Any]:
@@ -76,7 +138,17 @@ def _build_filing_payload(event: FilingEvent, analysis: AnalysisResult) -> Dict[
     archive_base = event.sec_archive_base_url()
     cik_stripped = event.normalized_cik()
     accession_stripped = event.accession_no_dashes()
-    documents = [_document_metadata(doc, archive_base) for doc in event.documents]
+    documents = [
+        {
+            "type": doc.type,
+            "sequence": doc.sequence,
+            "filename": doc.filename,
+            "description": doc.description,
+            "size_bytes": len(doc.content) if doc.content is not None else None,
+            "url": archive_base + doc.filename if archive_base and doc.filename else None,
+        }
+        for doc in event.documents
+    ]
 
     sec_txt_url = event.sec_txt_url()
     primary_document_raw, folder_code, primary_filename = _determine_primary_document_components(
@@ -98,8 +170,8 @@ def _build_filing_payload(event: FilingEvent, analysis: AnalysisResult) -> Dict[
         "company": {
             "name": company.name if company else None,
             "cik": company.cik if company else event.cik,
-            "tickers": company.tickers if company else [],
-            "exchanges": company.exchanges if company else [],
+            "tickers": list(company.tickers) if company else [],
+            "exchanges": list(company.exchanges) if company else [],
             "sic": company.sic if company else None,
             "category": company.category if company else None,
             "description": company.description if company else None,
@@ -140,19 +212,6 @@ def _build_filing_payload(event: FilingEvent, analysis: AnalysisResult) -> Dict[
     return payload
 
 
-def _document_metadata(document: FilingDocument, archive_base: Optional[str]) -> Dict[str, Any]:
-    size_bytes = len(document.content) if document.content is not None else None
-    doc_url = f"{archive_base}{document.filename}" if archive_base and document.filename else None
-    return {
-        "type": document.type,
-        "sequence": document.sequence,
-        "filename": document.filename,
-        "description": document.description,
-        "size_bytes": size_bytes,
-        "url": doc_url,
-    }
-
-
 def _select_primary_document(
     documents: list[FilingDocument],
     submission_metadata: Optional[Dict[str, Any]],
@@ -168,17 +227,16 @@ def _select_primary_document(
         if isinstance(meta_candidate, str) and meta_candidate.strip():
             return meta_candidate.strip()
 
-    def _html_docs():
-        for doc in documents:
-            if doc.filename and doc.filename.lower().endswith((".htm", ".html")):
-                yield doc
+    html_docs = [
+        doc for doc in documents if doc.filename and doc.filename.lower().endswith(HTML_SUFFIXES)
+    ]
 
-    for doc in _html_docs():
+    for doc in html_docs:
         if doc.sequence and doc.sequence.strip().lstrip("0") in ("1", ""):
             return doc.filename
 
-    for doc in _html_docs():
-        return doc.filename
+    if html_docs:
+        return html_docs[0].filename
 
     for doc in documents:
         if doc.filename:
@@ -199,49 +257,81 @@ def _build_index_url(
 
 
 def _fetch_default_document_url(index_url: Optional[str]) -> Optional[str]:
+    """
+    Resolve the primary document link on an EDGAR index page.
+
+    Index pages are immutable, so resolved links are remembered (oldest evicted first);
+    failures are not, letting a lookup that hit a 429/5xx or timeout be retried later.
+    """
     if not index_url:
         return None
+    cached = _DEFAULT_DOCUMENT_URLS.get(index_url)
+    if cached is not None:
+        return cached
+    url = _resolve_default_document_url(index_url)
+    if url is not None:
+        with _DEFAULT_DOCUMENT_URLS_LOCK:
+            if len(_DEFAULT_DOCUMENT_URLS) >= DEFAULT_DOCUMENT_CACHE_SIZE:
+                del _DEFAULT_DOCUMENT_URLS[next(iter(_DEFAULT_DOCUMENT_URLS))]
+            _DEFAULT_DOCUMENT_URLS[index_url] = url
+    return url
+
+
+def _resolve_default_document_url(index_url: str) -> Optional[str]:
     try:
-        response = requests.get(
-            index_url,
-            headers={"User-Agent": DEFAULT_USER_AGENT},
-            timeout=15,
-        )
-        response.raise_for_status()
+        with _get_sec_session().get(index_url, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            href = _stream_first_document_href(response)
     except requests.RequestException as exc:
         LOGGER.debug("Failed to fetch index HTML %s: %s", index_url, exc)
         return None
 
-    parser = _FirstDocumentLinkParser()
-    parser.feed(response.text)
-    href = parser.best_link()
     if not href:
         return None
     return urljoin(index_url, href)
 
 
+def _stream_first_document_href(response: requests.Response) -> Optional[str]:
+    """Feed the index page to the link parser chunk by chunk, stopping at the first link."""
+    try:
+        decoder_factory = codecs.getincrementaldecoder(response.encoding or "utf-8")
+    except LookupError:
+        decoder_factory = codecs.getincrementaldecoder("utf-8")
+    decoder = decoder_factory(errors="replace")
+    parser = _FirstDocumentLinkParser()
+    chunks = response.iter_content(INDEX_CHUNK_SIZE)
+    received = 0
+    for chunk in chunks:
+        received += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.first_link is not None or received >= INDEX_SCAN_LIMIT:
+            # Finish reading the (usually small) rest of the body without parsing it.
+            for chunk in chunks:
+                received += len(chunk)
+                if received >= INDEX_DRAIN_LIMIT:
+                    break
+            return parser.first_link
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    return parser.first_link
+
+
 class _FirstDocumentLinkParser(HTMLParser):
     """Capture the first document hyperlink from the SEC index page."""
 
     def __init__(self) -> None:
         super().__init__()
-        self._first_link: Optional[str] = None
+        self.first_link: Optional[str] = None
 
     def handle_starttag(self, tag, attrs):
-        if tag.lower() != "a":
+        # Tag and attribute names arrive lower-cased; comments and script bodies never get here.
+        if self.first_link is not None or tag != "a":
             return
-        href = None
         for key, value in attrs:
-            if key.lower() == "href":
-                href = value
-                break
-        if not href:
-            return
-        if self._first_link is None:
-            self._first_link = href
-
-    def best_link(self) -> Optional[str]:
-        return self._first_link
+            if key == "href":
+                if value:
+                    self.first_link = value
+                return
 
 
 def _determine_primary_document_components(
@@ -281,13 +371,7 @@ def _extract_filename_from_path(path: str) -> Optional[str]:
 def _pick_folder_from_mapping(form_type: Optional[str]) -> Optional[str]:
     if not form_type:
         return None
-    codes = EDGAR_XSL_MAP.get(form_type.upper())
-    if not codes:
-        return None
-    for code in codes:
-        if code:
-            return _normalize_folder_code(code)
-    return None
+    return FORM_FOLDER_CODES.get(form_type.upper())
 
 
 def _normalize_folder_code(folder: Optional[str]) -> Optional[str]:
@@ -299,6 +383,13 @@ def _normalize_folder_code(folder: Optional[str]) -> Optional[str]:
     return cleaned + "/"
 
 
+# EDGAR_XSL_MAP resolved once: upper-cased form type -> normalized folder of its first XSL code.
+FORM_FOLDER_CODES: Dict[str, Optional[str]] = {
+    form.upper(): _normalize_folder_code(next((code for code in codes if code), None))
+    for form, codes in EDGAR_XSL_MAP.items()
+}
+
+
 def _parse_webhook_mapping(raw: str | None) -> Dict[str, str]:
     """Parse environment-style webhook mappings of the form "url" => "thread_id"."""
 
@@ -306,20 +397,10 @@ def _parse_webhook_mapping(raw: str | None) -> Dict[str, str]:
         return {}
 
     mapping: Dict[str, str] = {}
-    for line in raw.splitlines():
-        cleaned = line.strip()
-        if not cleaned:
-            continue
-        if cleaned.startswith("#"):
-            continue
-        cleaned = cleaned.rstrip(",")
-        cleaned = cleaned.strip("[] ")
-        if "=>" not in cleaned:
-            continue
-
-        left, right = cleaned.split("=>", 1)
-        url = left.strip().strip('"\'')
-        thread_id = right.strip().strip('"\'')
+    for left, right in WEBHOOK_LINE_RE.findall(raw):
+        # Trim list brackets and the trailing comma of JSON-ish multi-line values.
+        url = left.lstrip("[ ").strip().strip('"\'')
+        thread_id = right.strip().rstrip(",").rstrip("[] ").strip().strip('"\'')
         if url:
             mapping[url] = thread_id
     return mapping
@@ -369,12 +450,14 @@ def _read_dotenv_block(env_var: str) -> Optional[str]:
 
 def _extract_multiline_assignment(path: Path, env_var: str) -> Optional[str]:
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            lines = handle.readlines()
+        text = path.read_text(encoding="utf-8")
     except OSError:
         return None
 
     prefix = f"{env_var}="
+    if prefix not in text:
+        return None
+    lines = text.split("\n")
     for index, line in enumerate(lines):
         if not line.startswith(prefix):
             continue
@@ -398,17 +481,47 @@ def _extract_multiline_assignment(path: Path, env_var: str) -> Optional[str]:
     return None
 
 
-def _render_template(data, context):
-    if isinstance(data, dict):
-        return {key: _render_template(value, context) for key, value in data.items()}
-    if isinstance(data, list):
-        return [_render_template(item, context) for item in data]
+def _compile_template_placeholders(data):
+    """
+    Return the template's placeholder tree, or None when nothing under ``data`` needs formatting.
+
+    Leaves that str.format would alter map to their format string; containers map to a
+    {key or index: subtree} dict covering only the children that hold such leaves.
+    """
     if isinstance(data, str):
+        return data if ("{" in data or "}" in data) else None
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = enumerate(data)
+    else:
+        return None
+    tree = {}
+    for key, value in items:
+        subtree = _compile_template_placeholders(value)
+        if subtree is not None:
+            tree[key] = subtree
+    return tree or None
+
+
+def _render_compiled_template(template, placeholders, context):
+    """
+    Format the template's placeholder leaves without deep-copying it.
+
+    Only the containers on a path to a placeholder are copied; every other value is shared
+    with the cached template, which must therefore be treated as read-only.
+    """
+    if placeholders is None:
+        return template
+    if isinstance(placeholders, str):
         try:
-            return data.format_map(context)
+            return placeholders.format_map(context)
         except KeyError:
-            return data
-    return data
+            return template
+    rendered = template.copy()
+    for key, subtree in placeholders.items():
+        rendered[key] = _render_compiled_template(template[key], subtree, context)
+    return rendered
 
 
 def _build_discord_context(event: FilingEvent, analysis: AnalysisResult) -> Dict[str, str]:
@@ -445,15 +558,34 @@ class DiscordReporter:
     webhook_mapping: Dict[str, str]
     template_path: Optional[Path] = None
     session: requests.Session = field(default_factory=requests.Session)
+    _template: Optional[dict] = field(default=None, init=False, repr=False)
+    _placeholders: Any = field(default=None, init=False, repr=False)
+    _targets: List[Tuple[str, Dict[str, str]]] = field(default_factory=list, init=False, repr=False)
+    _executor: Optional[ThreadPoolExecutor] = field(default=None, init=False, repr=False)
+    _executor_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Parse the template once; each publish copies and formats only the placeholder paths.
+        self._template = self._load_template()
+        if self._template is not None:
+            self._placeholders = _compile_template_placeholders(self._template)
+        # Query parameters depend only on the target, so build them once per webhook.
+        self._targets = [
+            (url, {"wait": "true", "thread_id": thread_id} if thread_id else {"wait": "true"})
+            for url, thread_id in self.webhook_mapping.items()
+            if url
+        ]
 
     def _load_template(self) -> Optional[dict]:
         if not self.template_path:
             return None
         try:
-            with self.template_path.open("r", encoding="utf-8") as handle:
-                return json.load(handle)
+            raw = self.template_path.read_bytes()
         except FileNotFoundError:
+            LOGGER.warning("Discord template %s not found; using the default message.", self.template_path)
             return None
+        try:
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
         except json.JSONDecodeError as exc:
             raise ValueError(f"Invalid Discord template JSON: {self.template_path}") from exc
 
@@ -462,9 +594,8 @@ class DiscordReporter:
             raise ValueError("No Discord webhook URLs configured.")
 
         context = _build_discord_context(event, analysis)
-        template = self._load_template()
-        if template is not None:
-            payload = _render_template(deepcopy(template), context)
+        if self._template is not None:
+            payload = _render_compiled_template(self._template, self._placeholders, context)
         else:
             headline = (
                 f"{context['company_name']} ({context['tickers']}) filed {context['submission_type']}"
@@ -483,17 +614,47 @@ class DiscordReporter:
             details.append(f"Source: {context['sec_txt_url']}")
             payload = {"content": headline + "\n" + "\n".join(details)}
 
-        for url, thread_id in self.webhook_mapping.items():
-            if not url:
-                continue
-            params = {"wait": "true"}
-            if thread_id:
-                params["thread_id"] = thread_id
+        targets = self._targets
+        if len(targets) <= 1:
+            errors = [self._post_one(url, params, payload) for url, params in targets]
+        else:
+            # Webhook POSTs are independent; overlap them and report every failure together.
+            executor = self._get_executor()
+            futures = [executor.submit(self._post_one, url, params, payload) for url, params in targets]
+            errors = [future.result() for future in futures]
+        errors = [error for error in errors if error]
+        if len(errors) == 1:
+            raise RuntimeError(errors[0])
+        if errors:
+            raise RuntimeError(
+                f"{len(errors)} of {len(targets)} Discord webhook calls failed: " + "; ".join(errors)
+            )
+
+    def _post_one(self, url: str, params: Dict[str, str], payload: Dict[str, Any]) -> Optional[str]:
+        """POST the payload to one webhook, returning an error message instead of raising."""
+        try:
             response = self.session.post(url, json=payload, params=params, timeout=15)
-            if response.status_code >= 400:
-                raise RuntimeError(
-                    f"Discord webhook call failed ({response.status_code}): {response.text}"
+        except requests.RequestException as exc:
+            return f"Discord webhook call failed: {exc}"
+        if response.status_code >= 400:
+            return f"Discord webhook call failed ({response.status_code}): {response.text}"
+        return None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=min(8, max(len(self.webhook_mapping), 1)),
+                    thread_name_prefix="DiscordReporter",
                 )
+            return self._executor
+
+    def close(self) -> None:
+        """Wait for in-flight webhook POSTs, then release the fan-out workers."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
 
 def load_discord_webhooks(mode: str) -> Dict[str, str]:
@@ -5,33 +5,102 @@ Utility helpers for text normalization and keyword scoring.
 from __future__ import annotations
 
 import html
+import multiprocessing
+import os
 import re
-from typing import Iterable, List, Tuple
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-SCRIPT_STYLE_RE = re.compile(r"<(script|style).*?>.*?</\1>", re.IGNORECASE | re.DOTALL)
+try:  # Optional accelerator for the keyword scan.
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+try:  # Optional native (Lexbor) HTML parser.
+    from selectolax.parser import HTMLParser as LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
+# The opening tag is matched with [^>]* so an unclosed <script> cannot backtrack across the document.
+SCRIPT_STYLE_RE = re.compile(r"<(script|style)[^>]*>.*?</\1>", re.IGNORECASE | re.DOTALL)
 HTML_TAG_RE = re.compile(r"<[^>]+>")
 SENTENCE_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9])")
 
 
 def normalize_whitespace(text: str) -> str:
     """Collapse repeated whitespace characters."""
-    return re.sub(r"\s+", " ", text).strip()
+    # str.split() uses the same Unicode whitespace definition as the regex \s class.
+    return " ".join(text.split())
 
 
 def html_to_text(content: str) -> str:
     """Remove basic markup and produce a plaintext representation."""
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(content)
+        tree.strip_tags(["script", "style"])
+        root = tree.root
+        return normalize_whitespace(root.text(separator=" ", strip=True)) if root else ""
     stripped = SCRIPT_STYLE_RE.sub(" ", content)
     stripped = HTML_TAG_RE.sub(" ", stripped)
     return normalize_whitespace(html.unescape(stripped))
 
 
+def iter_sentences(text: str) -> Iterator[str]:
+    """Lazily yield whitespace-normalized sentences, skipping blank fragments."""
+    start = 0
+    for match in SENTENCE_BOUNDARY_RE.finditer(text):
+        sentence = " ".join(text[start:match.start()].split())
+        start = match.end()
+        if sentence:
+            yield sentence
+    sentence = " ".join(text[start:].split())
+    if sentence:
+        yield sentence
+
+
 def split_sentences(text: str, limit: int | None = None) -> List[str]:
     """Split text into sentences with a simple rule-based approach."""
-    sentences = SENTENCE_BOUNDARY_RE.split(text)
-    sentences = [normalize_whitespace(sentence) for sentence in sentences if sentence.strip()]
     if limit is not None:
-        return sentences[:limit]
-    return sentences
+        # Stop scanning once enough sentences are found instead of splitting the whole filing.
+        return list(islice(iter_sentences(text), max(limit, 0)))
+    return list(iter_sentences(text))
+
+
+@lru_cache(maxsize=None)
+def _keyword_automaton(phrases: Tuple[str, ...]):
+    """Build (once per keyword set) an Aho-Corasick automaton over the given phrases."""
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+def keyword_counts(lowered: str, phrases: Tuple[str, ...]) -> Dict[str, int]:
+    """Count phrase occurrences in a single pass when pyahocorasick is available."""
+    if ahocorasick is None:
+        count = lowered.count
+        return {phrase: count(phrase) for phrase in phrases}
+    counts = dict.fromkeys(phrases, 0)
+    # The automaton reports overlapping hits; keep only those str.count would see.
+    next_start = dict.fromkeys(phrases, 0)
+    for end, phrase in _keyword_automaton(phrases).iter(lowered):
+        start = end + 1 - len(phrase)
+        if start < next_start[phrase]:
+            continue
+        next_start[phrase] = end + 1
+        counts[phrase] += 1
+    return counts
+
+
+def contains_any(lowered: str, phrases: Tuple[str, ...]) -> bool:
+    """Return True when any phrase occurs, stopping at the first automaton hit."""
+    if ahocorasick is None:
+        return any(phrase in lowered for phrase in phrases)
+    return next(_keyword_automaton(phrases).iter(lowered), None) is not None
 
 
 def keyword_score(text: str, keywords: Iterable[Tuple[str, float]]) -> float:
@@ -45,11 +114,38 @@ def keyword_score(text: str, keywords: Iterable[Tuple[str, float]]) -> float:
     keywords:
         Iterable of (phrase, weight).
     """
-    lowered = text.lower()
+    keywords = tuple(keywords)
+    counts = keyword_counts(text.lower(), tuple(phrase for phrase, _ in keywords))
     total = 0.0
     for phrase, weight in keywords:
-        occurrences = lowered.count(phrase)
+        occurrences = counts[phrase]
         if occurrences:
             total += weight * occurrences
     return total
 
+
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the process pool shared by submission parsing and batch analysis."""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            # The pool is created while fetch, pipeline and Discord threads are running;
+            # forking such a process can deadlock the child, so never use the fork method.
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=multiprocessing.get_context(method)
+            )
+        return _PROCESS_POOL
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared process pool if it was started."""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        pool, _PROCESS_POOL = _PROCESS_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True)